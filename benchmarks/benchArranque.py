@@ -0,0 +1,47 @@
+#
+# Revision de regresiones en el arranque de python -m graphgen usando
+# python -X importtime. Para un grafo pequeno en texto no se debe importar
+# numpy ni networkx, y lo que se importe de mas respecto a un interprete
+# vacio debe quedar bajo el limite.
+# ejecucion: python benchmarks/benchArranque.py [limite_ms]
+# termina con codigo 1 si alguna revision falla
+#
+import os
+import subprocess
+import sys
+import tempfile
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+limit = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+
+PROHIBIDOS = ("numpy", "networkx")
+
+
+def importaciones(code):
+	"""Regresa {modulo: tiempo propio en us} de python -X importtime code."""
+	p = subprocess.run([sys.executable, "-X", "importtime"] + code, cwd=root, capture_output=True, text=True, check=True)
+	times = {}
+	for line in p.stderr.splitlines():
+		if not line.startswith("import time:") or "[us]" in line:
+			continue
+		own, _, name = line[len("import time:"):].split("|")
+		times[name.strip()] = int(own)
+	return times
+
+
+with tempfile.TemporaryDirectory() as tmp:
+	base = importaciones(["-c", "pass"])
+	times = importaciones(["-m", "graphgen", "mesh2d", os.path.join(tmp, "out.txt"), "20", "20"])
+
+extra = {name: t for name, t in times.items() if name not in base}
+total = sum(extra.values()) / 1000
+print("importaciones extra: %d modulos, %.1f ms (limite %.1f ms)" % (len(extra), total, limit))
+for name, t in sorted(extra.items(), key=lambda e: -e[1])[:10]:
+	print("  %8.1f ms  %s" % (t / 1000, name))
+
+fallas = [name for name in extra if name.split(".")[0] in PROHIBIDOS]
+if fallas:
+	print("ERROR: se importaron %s" % ", ".join(sorted(fallas)))
+if total > limit:
+	print("ERROR: el arranque excede el limite")
+sys.exit(1 if fallas or total > limit else 0)
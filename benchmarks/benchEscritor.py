@@ -0,0 +1,46 @@
+#
+# Compara el ciclo original "%d %d\n" arista por arista sobre W.edges()
+# contra el escritor por bloques de graphgen.escritor, con una malla de
+# n x n nodos
+# ejecucion: python benchmarks/benchEscritor.py [n] [archivo_temporal]
+#
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import networkx as nx
+from graphgen import escritor, familias, tamanos
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+fileName = sys.argv[2] if len(sys.argv) > 2 else "bench_output.txt"
+
+
+def cicloOriginal():
+	W = nx.convert_node_labels_to_integers(nx.grid_2d_graph(n, n))
+	t = time.perf_counter()
+	fo = open(fileName, "w")
+	for e in W.edges(data=False):
+		arco = "%d %d\n" % (e[0], e[1])
+		fo.write(arco)
+	fo.close()
+	return time.perf_counter() - t
+
+
+def escritorBloques():
+	chunks = list(familias.mesh2d_edges(n, n))
+	t = time.perf_counter()
+	with open(fileName, "wb") as fo:
+		escritor.escribe_bloques(fo, chunks)
+	return time.perf_counter() - t
+
+
+lines = tamanos.mesh2d_size(n, n)[1]
+rates = []
+for name, fn in (("ciclo original", cicloOriginal), ("escritor por bloques", escritorBloques)):
+	dt = fn()
+	rates.append(lines / dt)
+	print("%-22s %8.2f s %10.2f Mlineas/s" % (name, dt, lines / dt / 1e6))
+
+os.remove(fileName)
+print("aceleracion: %.1fx" % (rates[1] / rates[0]))
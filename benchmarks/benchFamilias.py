@@ -0,0 +1,141 @@
+#
+# Escalamiento de todas las familias: cada una corre sobre una escalera
+# geometrica de tamanos (numero de aristas objetivo min, min*f, ... max) con
+# la implementacion original en networkx y con los caminos nativos, cada
+# corrida en su propio proceso. Se registra tiempo de pared, memoria maxima
+# (RSS), aristas/s y bytes de salida/s.
+# ejecucion: python benchmarks/benchFamilias.py [--out resultados.json]
+#            [--min 10000] [--max 4000000] [--factor 4] [--max-networkx 1000000]
+#            [--families path,cycle,...] [--paths networkx,text,npy,csr]
+#            [--repeat 1] [--compare resultados_anteriores.json]
+# Los resultados quedan en JSON junto con el commit, para comparar entre
+# commits con --compare (razon de tiempos nuevo/anterior por corrida).
+#
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, root)
+from graphgen import tamanos
+
+# Parametros de cada familia para un numero de aristas objetivo e
+ESCALERA = {
+	"path": lambda e: {"n": e + 1},
+	"cycle": lambda e: {"n": e},
+	"mesh2d": lambda e: {"n": math.isqrt(e // 2), "m": math.isqrt(e // 2)},
+	"grid": lambda e: {"dims": [max(3, round((e / 3) ** (1 / 3)))] * 3, "periodic": True},
+	"tree": lambda e: {"h": max(1, round(math.log2(e + 2)) - 1), "r": 2},
+	"bipartite": lambda e: {"n1": math.isqrt(e), "n2": math.isqrt(e)},
+}
+
+# Opciones de la linea de comandos de cada camino
+CAMINOS = {
+	"networkx": ["--networkx"],
+	"text": [],
+	"npy": ["--format", "npy"],
+	"csr": ["--format", "csr"],
+}
+
+
+def argumentos(family, params):
+	if family == "grid":
+		return [str(d) for d in params["dims"]] + (["--periodic"] if params["periodic"] else [])
+	return [str(v) for v in params.values()]
+
+
+def tamano(path):
+	if os.path.isdir(path):
+		return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+	return os.path.getsize(path)
+
+
+def corre(cmd):
+	"""Regresa (segundos, RSS maximo en bytes) del proceso cmd."""
+	t = time.perf_counter()
+	p = subprocess.Popen(cmd, cwd=root)
+	_, status, usage = os.wait4(p.pid, 0)
+	dt = time.perf_counter() - t
+	p.returncode = os.waitstatus_to_exitcode(status)
+	if p.returncode:
+		raise subprocess.CalledProcessError(p.returncode, cmd)
+	return dt, usage.ru_maxrss * 1024
+
+
+def commit():
+	p = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True)
+	return p.stdout.strip() or None
+
+
+def escalera(lo, hi, factor):
+	e = lo
+	while e <= hi:
+		yield e
+		e *= factor
+
+
+ap = argparse.ArgumentParser()
+ap.add_argument("--out", default="bench_familias.json")
+ap.add_argument("--min", type=int, default=10000)
+ap.add_argument("--max", type=int, default=4000000)
+ap.add_argument("--factor", type=int, default=4)
+ap.add_argument("--max-networkx", type=int, default=1000000)
+ap.add_argument("--families", default=",".join(ESCALERA))
+ap.add_argument("--paths", default=",".join(CAMINOS))
+ap.add_argument("--repeat", type=int, default=1)
+ap.add_argument("--compare")
+a = ap.parse_args()
+
+results = []
+with tempfile.TemporaryDirectory() as tmp:
+	for family in a.families.split(","):
+		for target in escalera(a.min, a.max, a.factor):
+			params = ESCALERA[family](target)
+			nodes, edges = getattr(tamanos, family + "_size")(**params)
+			for camino in a.paths.split(","):
+				if camino == "networkx" and edges > a.max_networkx:
+					continue
+				out = os.path.join(tmp, "out")
+				cmd = [sys.executable, "-m", "graphgen", family, out] + argumentos(family, params) + CAMINOS[camino]
+				runs = []
+				for _ in range(a.repeat):
+					shutil.rmtree(out, ignore_errors=True)
+					if os.path.isfile(out):
+						os.remove(out)
+					runs.append(corre(cmd))
+				wall = min(dt for dt, _ in runs)
+				rss = max(r for _, r in runs)
+				size = tamano(out)
+				r = {
+					"family": family, "path": camino, "params": params, "nodes": nodes, "edges": edges,
+					"bytes": size, "wall_s": wall, "peak_rss": rss,
+					"edges_per_s": edges / wall, "bytes_per_s": size / wall,
+				}
+				results.append(r)
+				print("%-10s %-8s %12d aristas %8.3f s %8.1f MB %8.2f Maristas/s %8.1f MB/s" % (
+					family, camino, edges, wall, rss / 2**20, edges / wall / 1e6, size / wall / 2**20))
+
+info = {
+	"commit": commit(), "python": platform.python_version(), "platform": platform.platform(),
+	"cpus": os.cpu_count(), "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results,
+}
+with open(a.out, "w") as fo:
+	json.dump(info, fo, indent=1)
+print("resultados en %s" % a.out)
+
+if a.compare:
+	with open(a.compare) as fo:
+		old = json.load(fo)
+	before = {(r["family"], r["path"], r["edges"]): r for r in old["results"]}
+	print("comparacion contra %s (commit %s): tiempo nuevo / anterior" % (a.compare, old.get("commit")))
+	for r in results:
+		o = before.get((r["family"], r["path"], r["edges"]))
+		if o is not None:
+			print("%-10s %-8s %12d aristas %6.2fx" % (r["family"], r["path"], r["edges"], r["wall_s"] / o["wall_s"]))
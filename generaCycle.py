@@ -1,29 +1,10 @@
 #
 # Genera grafos tipo cycle con n nodos y n arcos
-# ejecucion: python generaCycle.py archivo_salida n 
+# ejecucion: python generaCycle.py archivo_salida n [--format text|npy|csr] [--workers N] [--networkx]
 # 
 #
 import sys
-import networkx as nx
+from graphgen import cli
 
-
-fileName = sys.argv[1]
-n = int(sys.argv[2])
-
-G = nx.cycle_graph(n)
-heading = "%% Cycle con n=%d nodes y m=%d arcos\n" % (n, n)
-W = nx.convert_node_labels_to_integers(G)
-
-# Open a file
-fo = open(fileName, "w")
-
-fo.write(heading);
-heading2 = "%d %d %d\n" % (W.number_of_nodes(), W.number_of_nodes(), W.number_of_edges())
-fo.write(heading2);
-
-for e in W.edges(data=False):
-	arco = "%d %d\n" % (e[0], e[1])
-	fo.write(arco)
-
-# Close opend file
-fo.close()
+if __name__ == "__main__":
+	cli.main(["cycle"] + sys.argv[1:])
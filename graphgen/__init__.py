@@ -0,0 +1,3 @@
+#
+# Rutinas compartidas por los scripts genera*.py
+#
@@ -0,0 +1,3 @@
+from graphgen.cli import main
+
+main()
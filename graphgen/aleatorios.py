@@ -0,0 +1,476 @@
+#
+# Generadores nativos de grafos aleatorios, con la misma interfaz que
+# graphgen.familias: <family>_blocks y <family>_edges(..., chunk, start,
+# stop) por bloques. Cada bloque tiene su propio flujo de numeros
+# aleatorios derivado de (semilla, familia, bloque), asi que el grafo solo
+# depende de la semilla: no de `chunk` ni de cuantos procesos se repartan
+# los bloques.
+#
+import numpy as np
+
+from graphgen.etiquetas import Feistel
+from graphgen.familias import CHUNK
+
+# Identificadores de cada familia para separar sus flujos aleatorios
+_GNP = 1
+_GNM = 2
+_RMAT = 3
+_BA = 4
+_REGULAR = 5
+
+# Rondas de reparacion de regular_edges antes de darse por vencido
+RONDAS = 100
+
+
+def _rng(seed, family, block):
+	return np.random.default_rng(np.random.SeedSequence([seed, family, block]))
+
+
+def _par(t):
+	"""Convierte el indice t de la pareja w < v, en el orden
+	(0,1), (0,2), (1,2), (0,3), ..., en los arreglos (w, v)."""
+	v = ((1 + np.sqrt(1 + 8 * t.astype(np.float64))) / 2).astype(np.int64)
+	# La raiz en punto flotante puede quedar corrida por uno
+	v -= v * (v - 1) // 2 > t
+	v += (v + 1) * v // 2 <= t
+	return t - v * (v - 1) // 2, v
+
+
+def _gnp_tramo(n, p):
+	# Parejas por bloque: en promedio CHUNK aristas, sin depender de chunk
+	return max(int(CHUNK / p), 1) if p > 0 else 1
+
+
+def gnp_blocks(n, p, seed=0, chunk=CHUNK):
+	"""Numero de bloques que produce gnp_edges."""
+	if p <= 0:
+		return 0
+	return -(-(n * (n - 1) // 2) // _gnp_tramo(n, p))
+
+
+def gnp_edges(n, p, seed=0, chunk=CHUNK, start=0, stop=None):
+	"""Aristas (w, v), w < v, de G(n, p) ordenadas por v y luego por w.
+
+	Las parejas se recorren por su indice y los saltos entre aristas
+	consecutivas son geometricos de parametro p (Batagelj y Brandes), asi
+	que el costo es O(n + m). Cada bloque es un tramo de parejas, es decir
+	de filas v consecutivas, con su propia semilla.
+	"""
+	pairs = n * (n - 1) // 2
+	step = _gnp_tramo(n, p)
+	blocks = gnp_blocks(n, p)
+	for b in range(start, blocks if stop is None else min(stop, blocks)):
+		lo, hi = b * step, min((b + 1) * step, pairs)
+		rng = _rng(seed, _GNP, b)
+		pos = lo - 1
+		while pos < hi:
+			# Un salto de hi - pos o mas ya termina el tramo; acotarlo no
+			# cambia las aristas y evita desbordar la suma con p pequena
+			g = rng.geometric(p, size=chunk)
+			np.minimum(g, hi - pos, out=g)
+			if chunk * (hi - pos) >= 1 << 62:
+				# Aun acotados, chunk saltos pueden desbordar: basta con
+				# los que llegan a hi
+				g = g[:int(np.searchsorted(np.cumsum(g, dtype=np.float64), 2 * (hi - pos))) + 1]
+			t = np.cumsum(g, out=g)
+			t += pos
+			pos = int(t[-1])
+			t = t[t < hi]
+			if len(t):
+				yield _par(t)
+
+
+def _gnm_tramo(n, m):
+	# Parejas por bloque: en promedio CHUNK aristas, sin depender de chunk
+	pairs = n * (n - 1) // 2
+	return max(-(-CHUNK * pairs // m), 1) if m else max(pairs, 1)
+
+
+def gnm_blocks(n, m, seed=0, chunk=CHUNK):
+	"""Numero de bloques que produce gnm_edges."""
+	return -(-(n * (n - 1) // 2) // _gnm_tramo(n, m))
+
+
+def _gnm_cuentas(n, m, seed):
+	"""Cuantas de las m aristas caen en cada bloque de parejas."""
+	pairs = n * (n - 1) // 2
+	if m > pairs:
+		raise ValueError("G(%d, m) tiene a lo mas %d aristas, no %d" % (n, pairs, m))
+	step = _gnm_tramo(n, m)
+	sizes = np.full(gnm_blocks(n, m), step, dtype=np.int64)
+	if len(sizes):
+		sizes[-1] = pairs - step * (len(sizes) - 1)
+	rng = _rng(seed, _GNM, 0)
+	if pairs < 10 ** 9:
+		return rng.multivariate_hypergeometric(sizes, m, method="marginals")
+	# NumPy no tiene la hipergeometrica para poblaciones tan grandes: se
+	# aproxima cada bloque con una binomial condicionada a lo que falta, asi
+	# que el total sigue siendo exactamente m
+	counts = np.zeros(len(sizes), dtype=np.int64)
+	left, rest = m, pairs
+	for b, size in enumerate(sizes.tolist()):
+		rest -= size
+		k = rng.binomial(left, size / (size + rest)) if rest else left
+		counts[b] = min(max(k, left - rest), size, left)
+		left -= counts[b]
+	return counts
+
+
+def _unicos(x):
+	# np.unique hace lo mismo, pero en NumPy 2 es varias veces mas lento
+	x = np.sort(x)
+	return x[np.concatenate(([True], x[1:] != x[:-1]))] if len(x) else x
+
+
+def _distintos(rng, size, k):
+	"""k enteros distintos de [0, size), ordenados."""
+	if 2 * k > size:
+		# Cerca del grafo completo conviene sortear los que faltan
+		out = _distintos(rng, size, size - k)
+		keep = np.ones(size, dtype=bool)
+		keep[out] = False
+		return np.flatnonzero(keep)
+	keys = np.empty(0, dtype=np.uint64)
+	while len(keys) < k:
+		extra = k - len(keys)
+		draw = rng.integers(0, size, size=extra + extra // 8 + 16, dtype=np.uint64)
+		keys = _unicos(np.concatenate((keys, draw)))
+	if len(keys) > k:
+		# Quitar los sobrantes al azar deja un subconjunto uniforme
+		keys = np.sort(rng.choice(keys, k, replace=False))
+	return keys.astype(np.int64)
+
+
+def gnm_edges(n, m, seed=0, chunk=CHUNK, start=0, stop=None):
+	"""Aristas (w, v), w < v, de G(n, m) ordenadas por v y luego por w.
+
+	El total m se reparte entre los bloques de parejas con la
+	hipergeometrica multivariada, y cada bloque sortea sus parejas como
+	llaves enteras (el indice de la pareja), quitando repetidas con
+	ordenamiento hasta tener exactamente las que le tocan; si le tocan mas de
+	la mitad, sortea las que no estan.
+	"""
+	pairs = n * (n - 1) // 2
+	step = _gnm_tramo(n, m)
+	counts = _gnm_cuentas(n, m, seed)
+	for b in range(start, len(counts) if stop is None else min(stop, len(counts))):
+		lo = b * step
+		t = lo + _distintos(_rng(seed, _GNM, b + 1), min(step, pairs - lo), int(counts[b]))
+		for i in range(0, len(t), chunk):
+			yield _par(t[i:i + chunk])
+
+
+def rmat_blocks(scale, edgefactor=16, a=0.57, b=0.19, c=0.19, noise=0.0, permute=False, seed=0, chunk=CHUNK):
+	"""Numero de bloques que produce rmat_edges."""
+	return -(-(edgefactor << scale) // CHUNK)
+
+
+def _rmat_niveles(scale, a, b, c, noise, seed):
+	"""Probabilidades (a, b, c) de cada nivel; con ruido, cada nivel mueve
+	mu ~ U[-noise, noise] de la diagonal a b y c (NSKG, Seshadhri et al.)."""
+	if not noise:
+		return np.full(scale, a), np.full(scale, b), np.full(scale, c)
+	d = 1 - a - b - c
+	mu = _rng(seed, _RMAT, 0).uniform(-noise, noise, size=scale)
+	return a - 2 * mu * a / (a + d), b + mu, c + mu
+
+
+def rmat_edges(scale, edgefactor=16, a=0.57, b=0.19, c=0.19, noise=0.0, permute=False, seed=0, chunk=CHUNK, start=0, stop=None):
+	"""Aristas dirigidas (u, v) de R-MAT con probabilidades (a, b, c, d).
+
+	Cada bloque de CHUNK aristas toma su flujo de
+	SeedSequence([seed, _RMAT]).spawn, y en cada nivel un solo uniforme por
+	arista decide el cuadrante, es decir el bit de u y el de v. Con
+	`permute` los nodos se reetiquetan con una permutacion de Feistel, como
+	la permutacion de vertices de Graph500. Se conservan las aristas
+	repetidas y los lazos.
+	"""
+	edges = edgefactor << scale
+	pa, pb, pc = _rmat_niveles(scale, a, b, c, noise, seed)
+	perm = Feistel(1 << scale, [seed, _RMAT]) if permute else None
+	blocks = rmat_blocks(scale, edgefactor)
+	root = np.random.SeedSequence([seed, _RMAT])
+	for blk in range(start, blocks if stop is None else min(stop, blocks)):
+		size = min(CHUNK, edges - blk * CHUNK)
+		rng = np.random.default_rng(np.random.SeedSequence(root.entropy, spawn_key=(blk,)))
+		u = np.zeros(size, dtype=np.int64)
+		v = np.zeros(size, dtype=np.int64)
+		for i in range(scale):
+			# Un uniforme de 32 bits por arista y nivel; los umbrales como
+			# float de Python para que la comparacion no suba a 64 bits
+			r = rng.random(size, dtype=np.float32)
+			down = r >= float(pa[i] + pb[i])
+			right = (r >= float(pa[i])) != (down & (r < float(pa[i] + pb[i] + pc[i])))
+			u <<= 1
+			v <<= 1
+			u |= down
+			v |= right
+		if perm is not None:
+			u, v = perm(u), perm(v)
+		for lo in range(0, size, chunk):
+			yield u[lo:lo + chunk], v[lo:lo + chunk]
+
+
+def ba_blocks(n, m, seed=0, chunk=CHUNK):
+	"""Barabasi-Albert es secuencial: un solo bloque."""
+	return 1 if m * (n - m) else 0
+
+
+def _ba_origen(e, m):
+	# Nodo que agrega la arista e: el centro de la estrella inicial (0) para
+	# las primeras m, y despues m aristas por nodo desde m + 1
+	return np.where(e < m, 0, m + 1 + (e - m) // m)
+
+
+def _ba_resuelve(r, T, k0, m, cuales=None, marca=None):
+	"""Valor de las posiciones r[cuales] (todas si es None) del arreglo de
+	extremos repetidos [origen(0), destino(0), origen(1), destino(1), ...];
+	los destinos de las aristas desde k0 todavia no estan en T y salen de su
+	propio sorteo r. Con `marca`, regresa ademas si cada valor paso por un
+	sorteo marcado."""
+	pos = r.copy() if cuales is None else r[cuales]
+	val = np.empty(len(pos), dtype=np.int64)
+	toca = np.zeros(len(pos), dtype=bool)
+	pend = np.arange(len(pos))
+	while len(pend):
+		p = pos[pend]
+		e = p >> 1
+		par = (p & 1) == 0
+		val[pend[par]] = _ba_origen(e[par], m)
+		viejo = ~par & (e < k0)
+		val[pend[viejo]] = T[e[viejo]]
+		# El destino de una arista del mismo lote apunta a su sorteo, que
+		# siempre es una posicion anterior
+		nuevo = ~par & (e >= k0)
+		pend = pend[nuevo]
+		pos[pend] = r[e[nuevo] - k0]
+		if marca is not None:
+			toca[pend] |= marca[e[nuevo] - k0]
+	return val if marca is None else (val, toca)
+
+
+def ba_edges(n, m, seed=0, chunk=CHUNK, start=0, stop=None):
+	"""Aristas (0, j) de la estrella inicial y despues (v, w), w < v, de
+	Barabasi-Albert como networkx.barabasi_albert_graph: estrella inicial
+	de m + 1 nodos y cada nodo nuevo se une a m nodos distintos con
+	probabilidad proporcional a su grado.
+
+	Se usa el arreglo de extremos repetidos (Batagelj y Brandes): escoger
+	con probabilidad proporcional al grado es escoger una posicion al azar.
+	Los origenes se calculan, asi que solo se guardan los m(n - m) destinos,
+	en uint32 si caben. Los sorteos de un lote de s / m nodos son
+	independientes y se hacen juntos; cada destino que cae en el mismo lote
+	se resuelve siguiendo los sorteos hacia atras. Un nodo con destinos
+	repetidos vuelve a sortear solo los repetidos, en cuanto sus valores ya
+	no dependen de otro nodo con repetidos del lote.
+	"""
+	if start > 0 or stop == 0 or not ba_blocks(n, m):
+		return
+	edges = m * (n - m)
+	T = np.empty(edges, dtype=np.uint32 if n <= 1 << 32 else np.int64)
+	T[:m] = np.arange(1, m + 1)
+	yield np.zeros(m, dtype=np.int64), T[:m].astype(np.int64)
+	rng = _rng(seed, _BA, 0)
+	s = m + 1
+	while s < n:
+		nodos = min(n - s, max(1, CHUNK // m), max(1, s // (m + 16)))
+		k0 = m + (s - m - 1) * m
+		k1 = k0 + nodos * m
+		hi = 2 * (k0 + (np.arange(nodos) * m)).repeat(m)
+		r = rng.integers(0, hi)
+		while k0 < k1:
+			val = _ba_resuelve(r, T, k0, m)
+			filas = np.sort(val.reshape(-1, m), axis=1)
+			dup = (filas[:, 1:] == filas[:, :-1]).any(axis=1)
+			if not dup.any():
+				T[k0:k1] = val
+				break
+			# Las filas antes de la primera con repetidos ya son definitivas
+			i = int(dup.argmax()) * m
+			T[k0:k0 + i] = val[:i]
+			k0, r, hi, val, dup = k0 + i, r[i:], hi[i:], val[i:], dup[i // m:]
+			# Una fila con repetidos se corrige cuando sus valores ya no
+			# dependen de otra fila con repetidos, como si los nodos se
+			# agregaran de uno en uno
+			filas = np.flatnonzero(dup)
+			_, toca = _ba_resuelve(r, T, k0, m, (filas[:, None] * m + np.arange(m)).ravel(), dup.repeat(m))
+			listas = filas[~toca.reshape(-1, m).any(axis=1)]
+			F = val.reshape(-1, m)[listas]
+			orden = np.argsort(F, axis=1, kind="stable")
+			F = np.take_along_axis(F, orden, axis=1)
+			# Se vuelven a sortear las repeticiones, no la primera aparicion
+			rep = np.zeros(F.shape, dtype=bool)
+			np.put_along_axis(rep, orden[:, 1:], F[:, 1:] == F[:, :-1], axis=1)
+			j = (listas[:, None] * m + np.arange(m))[rep]
+			r[j] = rng.integers(0, hi[j])
+		k0 = m + (s - m - 1) * m
+		for lo in range(k0, k1, chunk):
+			fin = min(lo + chunk, k1)
+			yield _ba_origen(np.arange(lo, fin), m), T[lo:fin].astype(np.int64)
+		s += nodos
+
+
+def regular_blocks(n, d, seed=0, chunk=CHUNK):
+	"""El modelo de configuracion empareja todo el grafo: un solo bloque."""
+	return 1 if n * d // 2 else 0
+
+
+def _regular_llaves(n, d, rng):
+	"""Emparejamiento uniforme de los n*d talones como llaves
+	min(u, v) * n + max(u, v), ordenadas."""
+	stubs = np.repeat(np.arange(n, dtype=np.uint32 if n <= 1 << 32 else np.int64), d)
+	rng.shuffle(stubs)
+	keys = np.empty(len(stubs) // 2, dtype=np.uint64)
+	for lo in range(0, len(keys), CHUNK):
+		u = stubs[2 * lo:2 * (lo + CHUNK):2].astype(np.uint64)
+		v = stubs[2 * lo + 1:2 * (lo + CHUNK):2].astype(np.uint64)
+		keys[lo:lo + len(u)] = np.minimum(u, v) * np.uint64(n) + np.maximum(u, v)
+	del stubs
+	keys.sort()
+	return keys
+
+
+def _regular_malas(keys, n):
+	"""Posiciones de los lazos y de las repeticiones (menos la primera) en
+	las llaves ordenadas; por tramos, para no duplicar las llaves en memoria."""
+	N = np.uint64(n)
+	malas = []
+	for lo in range(0, len(keys), CHUNK):
+		k = keys[lo:lo + CHUNK]
+		mal = k // N == k % N
+		mal[1:] |= k[1:] == k[:-1]
+		if lo and len(k):
+			mal[0] |= k[0] == keys[lo - 1]
+		malas.append(lo + np.flatnonzero(mal))
+	return np.concatenate(malas) if malas else np.empty(0, dtype=np.int64)
+
+
+def _regular_valores(keys, fuera, valores, pos):
+	"""Aristas actuales en las posiciones pos: las de keys, o las de
+	`valores` donde la posicion esta en `fuera`."""
+	val = keys[pos]
+	i = np.searchsorted(fuera, pos)
+	cambio = i < len(fuera)
+	cambio[cambio] = fuera[i[cambio]] == pos[cambio]
+	val[cambio] = valores[i[cambio]]
+	return val
+
+
+def _regular_vivas(keys, fuera, valores, k):
+	"""Cuantas veces esta cada llave k entre las aristas actuales."""
+	lo, hi = np.searchsorted(keys, k, "left"), np.searchsorted(keys, k, "right")
+	cuenta = (hi - lo) - (np.searchsorted(fuera, hi) - np.searchsorted(fuera, lo))
+	s = np.sort(valores)
+	return cuenta + np.searchsorted(s, k, "right") - np.searchsorted(s, k, "left")
+
+
+def regular_rondas(n, d, seed=0):
+	"""Regresa (llaves, rondas): las aristas de un grafo d-regular aleatorio
+	como llaves ordenadas y el numero de rondas de reparacion que hicieron
+	falta.
+
+	Los talones se barajan y se emparejan de dos en dos. Cada lazo o arista
+	repetida se repara con un intercambio que conserva los grados: con una
+	arista buena al azar (c, e), la mala (a, b) y ella se vuelven (a, c) y
+	(b, e), o (a, e) y (b, c). Todas las malas intercambian a la vez, y solo
+	se aceptan los intercambios cuyas dos aristas nuevas no son lazos ni
+	estan ya en el grafo ni en otro intercambio de la ronda; los demas lo
+	intentan otra vez en la ronda siguiente. Una arista buena nunca se
+	vuelve mala, asi que las malas solo disminuyen. El resultado es casi
+	uniforme: para d fijo solo O(d^2) aristas pasan por la reparacion.
+
+	Con d > (n - 1)/2 se genera el complemento, que es (n - 1 - d)-regular:
+	cerca del grafo completo casi ningun intercambio es valido.
+	"""
+	if 2 * d > n - 1:
+		comp, rondas = regular_rondas(n, n - 1 - d, seed)
+		w, v = _par(np.arange(n * (n - 1) // 2, dtype=np.int64))
+		keys = w.astype(np.uint64) * np.uint64(n) + v.astype(np.uint64)
+		keys.sort()
+		i = np.searchsorted(comp, keys)
+		i[i == len(comp)] = 0
+		return keys[comp[i] != keys] if len(comp) else keys, rondas
+	rng = _rng(seed, _REGULAR, 0)
+	keys = _regular_llaves(n, d, rng)
+	edges = len(keys)
+	N = np.uint64(n)
+	# Posiciones de keys que ya cambiaron y sus aristas actuales
+	fuera = np.empty(0, dtype=np.int64)
+	valores = np.empty(0, dtype=np.uint64)
+	malas = _regular_malas(keys, n)
+	rondas = 0
+	while len(malas):
+		if rondas == RONDAS:
+			raise ValueError("el grafo %d-regular con %d nodos no se pudo reparar en %d rondas" % (d, n, RONDAS))
+		rondas += 1
+		# Una arista buena al azar por cada mala
+		otras = rng.choice(edges, size=min(edges, 2 * len(malas)), replace=False)
+		otras = otras[~np.isin(otras, malas)][:len(malas)]
+		mala = malas[:len(otras)]
+		A = _regular_valores(keys, fuera, valores, mala)
+		B = _regular_valores(keys, fuera, valores, otras)
+		a, b = A // N, A % N
+		c, e = B // N, B % N
+		gira = rng.random(len(otras)) < 0.5
+		c, e = np.where(gira, e, c), np.where(gira, c, e)
+		k1 = np.minimum(a, c) * N + np.maximum(a, c)
+		k2 = np.minimum(b, e) * N + np.maximum(b, e)
+		nuevas = np.concatenate((k1, k2))
+		orden = np.argsort(nuevas, kind="stable")
+		s = nuevas[orden]
+		repetida = np.zeros(len(s), dtype=bool)
+		repetida[1:] = s[1:] == s[:-1]
+		repetida[:-1] |= repetida[1:]
+		mal = np.empty(len(s), dtype=bool)
+		mal[orden] = repetida
+		mal |= (nuevas // N == nuevas % N) | (_regular_vivas(keys, fuera, valores, nuevas) > 0)
+		ok = ~(mal[:len(otras)] | mal[len(otras):])
+		# Las posiciones cambiadas entran a (fuera, valores)
+		pos = np.concatenate((mala[ok], otras[ok]))
+		val = np.concatenate((k1[ok], k2[ok]))
+		i = np.searchsorted(fuera, pos)
+		esta = i < len(fuera)
+		esta[esta] = fuera[i[esta]] == pos[esta]
+		valores[i[esta]] = val[esta]
+		orden = np.argsort(pos[~esta])
+		fuera = np.insert(fuera, i[~esta][orden], pos[~esta][orden])
+		valores = np.insert(valores, i[~esta][orden], val[~esta][orden])
+		malas = np.concatenate((mala[~ok], malas[len(otras):]))
+	keys[fuera] = valores
+	keys.sort()
+	return keys, rondas
+
+
+def _regular_aristas(keys, n, chunk):
+	N = np.uint64(n)
+	for lo in range(0, len(keys), chunk):
+		k = keys[lo:lo + chunk]
+		yield (k // N).astype(np.int64), (k % N).astype(np.int64)
+
+
+def regular_edges(n, d, seed=0, chunk=CHUNK, start=0, stop=None):
+	"""Aristas (u, v), u < v, de un grafo d-regular aleatorio con n nodos,
+	ordenadas."""
+	if start > 0 or stop == 0 or not regular_blocks(n, d):
+		return
+	yield from _regular_aristas(regular_rondas(n, d, seed)[0], n, chunk)
+
+
+class _Regular:
+	"""regular_edges sobre llaves ya calculadas."""
+
+	def __init__(self, keys):
+		self.keys = keys
+
+	def __call__(self, n, d, seed=0, chunk=CHUNK, start=0, stop=None):
+		if start > 0 or stop == 0:
+			return iter(())
+		return _regular_aristas(self.keys, n, chunk)
+
+
+def regular_prepara(n, d, seed=0):
+	"""Genera el grafo antes de escribirlo: regresa un generador con la
+	interfaz de regular_edges y los datos para el encabezado (las rondas
+	de reparacion)."""
+	keys, rondas = regular_rondas(n, d, seed)
+	return _Regular(keys), {"repair_rounds": rondas}
@@ -0,0 +1,102 @@
+#
+# Orden aleatorio de las aristas sin tenerlas todas en memoria, en dos
+# pasadas: cada arista recibe una llave aleatoria de 64 bits y se manda al
+# archivo temporal del intervalo de llaves que le toca; despues cada
+# archivo se carga y se ordena por llave. El resultado es el orden de todas
+# las aristas por su llave, una permutacion uniforme que depende solo de la
+# semilla: no del limite de memoria (que decide cuantos archivos hay) ni
+# del tamano de los bloques de entrada (las llaves se sortean por bloques
+# fijos de BLOQUE aristas).
+#
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from graphgen import binario
+
+BLOQUE = 1 << 18
+
+
+def _rebloques(chunks, size):
+	"""Los mismos (u, v) en bloques de exactamente `size` aristas."""
+	pend_u, pend_v, n = [], [], 0
+	for u, v in chunks:
+		pend_u.append(u)
+		pend_v.append(v)
+		n += len(u)
+		while n >= size:
+			u, v = np.concatenate(pend_u), np.concatenate(pend_v)
+			yield u[:size], v[:size]
+			pend_u, pend_v, n = [u[size:].copy()], [v[size:].copy()], n - size
+	if n:
+		yield np.concatenate(pend_u), np.concatenate(pend_v)
+
+
+class Barajado:
+	"""Baraja el flujo de aristas con la semilla `seed` usando a lo mas
+	`memoria` bytes para las aristas en memoria; los archivos temporales
+	van en `tmpdir`."""
+
+	def __init__(self, seed, memoria=1 << 30, tmpdir=None):
+		self.seed = seed
+		self.memoria = memoria
+		self.tmpdir = tmpdir
+
+	def encabezado(self):
+		return {"seed": self.seed}
+
+	def __call__(self, chunks, nodes, edges, chunk=BLOQUE):
+		"""Regresa los bloques (u, v) de `chunks` (edges aristas con
+		etiquetas < nodes) en orden aleatorio."""
+		dtype = binario.tipo_nodos(nodes)
+		record = np.dtype([("k", "<u8"), ("u", dtype), ("v", dtype)])
+		# Con el doble de cubetas de las necesarias casi nunca se pasa una
+		buckets = 1
+		while buckets * self.memoria < 2 * edges * record.itemsize:
+			buckets *= 2
+		rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(1,)))
+		if buckets == 1:
+			return self._en_memoria(chunks, record, rng, chunk)
+		return self._en_disco(chunks, record, rng, buckets, chunk)
+
+	def _registros(self, chunks, record, rng):
+		for u, v in _rebloques(chunks, BLOQUE):
+			r = np.empty(len(u), dtype=record)
+			r["k"] = rng.integers(0, 1 << 64, size=len(u), dtype=np.uint64, endpoint=False)
+			r["u"], r["v"] = u, v
+			yield r
+
+	def _ordena(self, r, chunk):
+		r = r[np.argsort(r["k"], kind="stable")]
+		for lo in range(0, len(r), chunk):
+			yield r["u"][lo:lo + chunk].astype(np.int64), r["v"][lo:lo + chunk].astype(np.int64)
+
+	def _en_memoria(self, chunks, record, rng, chunk):
+		parts = list(self._registros(chunks, record, rng))
+		yield from self._ordena(np.concatenate(parts) if parts else np.empty(0, dtype=record), chunk)
+
+	def _en_disco(self, chunks, record, rng, buckets, chunk):
+		tmp = tempfile.mkdtemp(prefix="graphgen-barajado-", dir=self.tmpdir)
+		try:
+			shift = np.uint64(64 - buckets.bit_length() + 1)
+			paths = [os.path.join(tmp, "%d.bin" % b) for b in range(buckets)]
+			files = [open(p, "wb") for p in paths]
+			try:
+				for r in self._registros(chunks, record, rng):
+					b = (r["k"] >> shift).astype(np.int64)
+					order = np.argsort(b, kind="stable")
+					cuts = np.searchsorted(b[order], np.arange(buckets + 1))
+					r = r[order]
+					for i in np.flatnonzero(np.diff(cuts)):
+						r[cuts[i]:cuts[i + 1]].tofile(files[i])
+			finally:
+				for fo in files:
+					fo.close()
+			for p in paths:
+				r = np.fromfile(p, dtype=record)
+				os.remove(p)
+				yield from self._ordena(r, chunk)
+		finally:
+			shutil.rmtree(tmp, ignore_errors=True)
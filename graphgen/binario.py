@@ -0,0 +1,149 @@
+#
+# Salida binaria: un directorio con arreglos .npy little-endian y un
+# encabezado header.json con n, m y los parametros de la familia.
+#   npy: edges.npy de forma (m, 2), en el mismo orden que el texto
+#   csr: indptr.npy (n+1) e indices.npy con las listas de adyacencia
+#        ordenadas de ambos sentidos de cada arista; para las familias sin
+#        formula de vecinos se arma a partir de las aristas por tramos de
+#        nodos (escribe_csr_aristas)
+# Los arreglos se escriben por bloques y se abren con
+# np.load(..., mmap_mode="r"). Las etiquetas empiezan siempre en 0.
+#
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+
+def tipo_nodos(nodes):
+	"""dtype mas chico con el que caben las etiquetas 0..nodes-1."""
+	return np.dtype("<u4") if nodes <= 1 << 32 else np.dtype("<i8")
+
+
+def _cabecera(fo, dtype, shape):
+	np.lib.format.write_array_header_1_0(fo, {
+		"descr": np.lib.format.dtype_to_descr(dtype),
+		"fortran_order": False,
+		"shape": shape,
+	})
+
+
+def _abre_npy(path, dtype, shape):
+	fo = open(path, "wb")
+	_cabecera(fo, dtype, shape)
+	return fo
+
+
+def _encabezado(dirName, header):
+	os.makedirs(dirName, exist_ok=True)
+	with open(os.path.join(dirName, "header.json"), "w") as fo:
+		json.dump(header, fo, indent=1)
+
+
+def escribe_npy(dirName, header, chunks):
+	"""Escribe los bloques de aristas (u, v) en dirName/edges.npy. Si
+	header["m"] es None, las aristas se cuentan al escribirlas y la forma
+	se corrige al final; NumPy deja espacio en la cabecera para que el
+	primer eje crezca sin mover los datos."""
+	dtype = tipo_nodos(header["n"])
+	os.makedirs(dirName, exist_ok=True)
+	path = os.path.join(dirName, "edges.npy")
+	with _abre_npy(path, dtype, (header["m"] or 0, 2)) as fo:
+		count = 0
+		for u, v in chunks:
+			fo.write(np.stack((u, v), axis=1).astype(dtype))
+			count += len(u)
+	if header["m"] is None:
+		header["m"] = count
+		with open(path, "r+b") as fo:
+			_cabecera(fo, dtype, (count, 2))
+	_encabezado(dirName, dict(header, format="npy", dtype=dtype.str))
+
+
+def escribe_csr(dirName, header, degrees, neighbors):
+	"""Escribe dirName/indptr.npy a partir de los bloques de grados y
+	dirName/indices.npy con los bloques de vecinos, ambos en orden de
+	nodo."""
+	dtype = tipo_nodos(header["n"])
+	os.makedirs(dirName, exist_ok=True)
+	nnz = 0
+	with _abre_npy(os.path.join(dirName, "indptr.npy"), np.dtype("<i8"), (header["n"] + 1,)) as fo:
+		fo.write(np.zeros(1, dtype="<i8"))
+		for d in degrees:
+			ptr = np.cumsum(d, dtype="<i8")
+			ptr += nnz
+			fo.write(ptr)
+			nnz = int(ptr[-1]) if len(ptr) else nnz
+	with _abre_npy(os.path.join(dirName, "indices.npy"), dtype, (nnz,)) as fo:
+		for block in neighbors:
+			fo.write(block.astype(dtype))
+	_encabezado(dirName, dict(header, format="csr", dtype=dtype.str, nnz=nnz))
+
+
+def _entradas(chunks):
+	# Cada arista en los dos sentidos, los lazos una sola vez
+	for u, v in chunks:
+		other = u != v
+		yield np.concatenate((u, v[other])), np.concatenate((v, u[other]))
+
+
+def _contadas(chunks, count):
+	for u, v in chunks:
+		count[0] += len(u)
+		yield u, v
+
+
+def escribe_csr_aristas(dirName, header, chunks, memoria=1 << 30, tmpdir=None, aristas=None):
+	"""Como escribe_csr, pero a partir de los bloques de aristas en
+	cualquier orden. Las entradas se reparten en archivos temporales por
+	tramos de nodos que caben en `memoria` bytes y cada tramo se ordena por
+	separado. Si header["m"] es None, `aristas` es una estimacion para
+	repartir la memoria y las aristas se cuentan al repartirlas."""
+	nodes = header["n"]
+	edges = header["m"] if header["m"] is not None else aristas or 0
+	dtype = tipo_nodos(nodes)
+	record = np.dtype([("row", dtype), ("col", dtype)])
+	parts = 1
+	while parts * memoria < 2 * 2 * edges * record.itemsize and parts < nodes:
+		parts *= 2
+	width = -(-nodes // parts) if nodes else 1
+	os.makedirs(dirName, exist_ok=True)
+	tmp = tempfile.mkdtemp(prefix="graphgen-csr-", dir=tmpdir)
+	try:
+		paths = [os.path.join(tmp, "%d.bin" % i) for i in range(parts)]
+		files = [open(path, "wb") for path in paths]
+		nnz = 0
+		count = [0]
+		try:
+			for row, col in _entradas(_contadas(chunks, count)):
+				r = np.empty(len(row), dtype=record)
+				r["row"], r["col"] = row, col
+				nnz += len(r)
+				part = row // width
+				order = np.argsort(part, kind="stable")
+				cuts = np.searchsorted(part[order], np.arange(parts + 1))
+				r = r[order]
+				for i in np.flatnonzero(np.diff(cuts)):
+					r[cuts[i]:cuts[i + 1]].tofile(files[i])
+		finally:
+			for fo in files:
+				fo.close()
+		with _abre_npy(os.path.join(dirName, "indptr.npy"), np.dtype("<i8"), (nodes + 1,)) as fp, \
+			_abre_npy(os.path.join(dirName, "indices.npy"), dtype, (nnz,)) as fi:
+			fp.write(np.zeros(1, dtype="<i8"))
+			total = 0
+			for i, path in enumerate(paths):
+				r = np.fromfile(path, dtype=record)
+				os.remove(path)
+				lo, hi = i * width, max(min((i + 1) * width, nodes), i * width)
+				r = r[np.lexsort((r["col"], r["row"]))]
+				ptr = np.cumsum(np.bincount(r["row"].astype(np.int64) - lo, minlength=hi - lo), dtype="<i8") + total
+				fp.write(ptr)
+				total = int(ptr[-1]) if len(ptr) else total
+				fi.write(r["col"].astype(dtype))
+	finally:
+		shutil.rmtree(tmp, ignore_errors=True)
+	if header["m"] is None:
+		header["m"] = count[0]
+	_encabezado(dirName, dict(header, format="csr", dtype=dtype.str, nnz=nnz))
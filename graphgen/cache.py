@@ -0,0 +1,192 @@
+#
+# Cache en disco de los archivos generados, direccionada por contenido:
+# la clave es un hash de la familia, los parametros, el formato de salida
+# y la version del generador (el hash de las fuentes de graphgen), asi que
+# cualquier cambio al codigo invalida las entradas viejas.
+#
+# Un acierto se sirve como reflink (copia en escritura, en btrfs/XFS) o, si
+# el sistema de archivos no lo soporta, como hardlink al archivo pedido. Las
+# entradas quedan de solo lectura: un hardlink comparte los bytes con la
+# cache, no hay que modificarlo en su lugar.
+#
+# Cada entrada tiene su candado (flock), asi dos trabajos que piden el mismo
+# grafo al mismo tiempo lo generan una sola vez. Despues de cada uso se
+# desalojan las entradas usadas hace mas tiempo (LRU, por mtime) hasta que
+# la cache cabe en su presupuesto de disco.
+#
+import contextlib
+import errno
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+# Presupuesto por omision
+PRESUPUESTO = 10 << 30
+
+# ioctl de Linux para clonar un archivo completo (reflink)
+FICLONE = 0x40049409
+
+_version = None
+
+
+def version():
+	"""Hash de las fuentes de graphgen."""
+	global _version
+	if _version is None:
+		h = hashlib.sha256()
+		for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+			with open(path, "rb") as fo:
+				h.update(fo.read())
+		_version = h.hexdigest()[:16]
+	return _version
+
+
+def clave(family, params, formato, networkx=False, relabel=None, shuffle=None):
+	"""Nombre de la entrada para un grafo."""
+	key = json.dumps([family, params, formato, bool(networkx), relabel, shuffle, version()], sort_keys=True)
+	return hashlib.sha256(key.encode()).hexdigest()
+
+
+def presupuesto(texto):
+	"""Convierte "500M", "10G", ... en bytes."""
+	texto = texto.strip().upper()
+	for i, s in enumerate("KMGT"):
+		if texto.endswith(s):
+			return int(float(texto[:-1]) * (1 << (10 * (i + 1))))
+	return int(texto)
+
+
+@contextlib.contextmanager
+def _candado(path, bloquea=True):
+	while True:
+		fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+		try:
+			fcntl.flock(fd, fcntl.LOCK_EX if bloquea else fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except BlockingIOError:
+			os.close(fd)
+			yield False
+			return
+		# desaloja borra el candado mientras lo tiene: si mientras
+		# esperabamos el archivo dejo de ser el nuestro, hay que volver a
+		# abrirlo
+		try:
+			if os.stat(path).st_ino == os.fstat(fd).st_ino:
+				break
+		except FileNotFoundError:
+			pass
+		os.close(fd)
+	try:
+		yield True
+	finally:
+		os.close(fd)
+
+
+def _archivos(path):
+	if os.path.isdir(path):
+		return [os.path.join(path, f) for f in sorted(os.listdir(path))]
+	return [path]
+
+
+def _borra(path):
+	if os.path.isdir(path) and not os.path.islink(path):
+		shutil.rmtree(path)
+	elif os.path.lexists(path):
+		os.remove(path)
+
+
+def _quita(path):
+	# Para una salida de un solo archivo: como open(path, "w"), un
+	# directorio en su lugar es un error, no algo que se borre
+	if os.path.isdir(path) and not os.path.islink(path):
+		raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+	if os.path.lexists(path):
+		os.remove(path)
+
+
+def _liga(src, dst):
+	if os.path.lexists(dst):
+		os.remove(dst)
+	try:
+		with open(src, "rb") as fi, open(dst, "wb") as fo:
+			fcntl.ioctl(fo.fileno(), FICLONE, fi.fileno())
+		os.chmod(dst, 0o644)
+		return
+	except OSError:
+		if os.path.lexists(dst):
+			os.remove(dst)
+	try:
+		os.link(src, dst)
+	except OSError:
+		# Otro sistema de archivos: no queda mas que copiar
+		shutil.copyfile(src, dst)
+
+
+def _entrega(entry, target):
+	if os.path.isdir(entry):
+		if os.path.lexists(target) and not os.path.isdir(target):
+			os.remove(target)
+		os.makedirs(target, exist_ok=True)
+		for f in _archivos(entry):
+			_liga(f, os.path.join(target, os.path.basename(f)))
+	else:
+		_quita(target)
+		_liga(entry, target)
+
+
+def _tamano(entry):
+	return sum(os.stat(f).st_size for f in _archivos(entry))
+
+
+def desaloja(dirName, budget, keep=None):
+	"""Borra las entradas usadas hace mas tiempo hasta que la cache ocupe a
+	lo mas `budget` bytes. Nunca borra `keep` ni entradas en uso."""
+	entries = []
+	for name in os.listdir(dirName):
+		path = os.path.join(dirName, name)
+		if len(name) == 64 and path != keep:
+			entries.append((os.stat(path).st_mtime, _tamano(path), path))
+	total = sum(size for _, size, _ in entries)
+	if keep is not None and os.path.exists(keep):
+		total += _tamano(keep)
+	for _, size, path in sorted(entries):
+		if total <= budget:
+			break
+		with _candado(path + ".lock", bloquea=False) as libre:
+			if libre and os.path.exists(path):
+				_borra(path)
+				os.remove(path + ".lock")
+				total -= size
+	return total
+
+
+def obten(dirName, key, target, produce, budget=PRESUPUESTO):
+	"""Deja en `target` la entrada `key`; si no existe primero la genera
+	con produce(path). Regresa True si fue un acierto."""
+	os.makedirs(dirName, exist_ok=True)
+	entry = os.path.join(dirName, key)
+	with _candado(entry + ".lock"):
+		hit = os.path.exists(entry)
+		if hit:
+			os.utime(entry)
+		else:
+			# Con la extension de target, que puede decidir el formato
+			tmp = entry + ".tmp" + os.path.splitext(target)[1]
+			_borra(tmp)
+			produce(tmp)
+			if not os.path.isdir(tmp):
+				# Falla antes de guardar una entrada que no se puede entregar
+				try:
+					_quita(target)
+				except IsADirectoryError:
+					_borra(tmp)
+					raise
+			for f in _archivos(tmp):
+				os.chmod(f, 0o444)
+			os.rename(tmp, entry)
+		_entrega(entry, target)
+	with _candado(os.path.join(dirName, "lock")):
+		desaloja(dirName, budget, keep=entry)
+	return hit
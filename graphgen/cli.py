@@ -0,0 +1,348 @@
+#
+# Punto de entrada unico para todas las familias:
+#   python -m graphgen path archivo_salida n
+#   python -m graphgen cycle archivo_salida n
+#   python -m graphgen mesh2d archivo_salida n m
+#   python -m graphgen grid archivo_salida d1 [d2 ...] [--periodic [p1 p2 ...]]
+#   python -m graphgen tree archivo_salida h r
+#   python -m graphgen bipartite archivo_salida n1 n2
+#   python -m graphgen gnp archivo_salida n p [--seed S]
+#   python -m graphgen gnm archivo_salida n m [--seed S]
+#   python -m graphgen ba archivo_salida n m [--seed S]
+#   python -m graphgen regular archivo_salida n d [--seed S]
+#   python -m graphgen rmat archivo_salida scale edgefactor [--a A --b B
+#       --c C --noise X --permute --seed S]
+# con las opciones [--format text|npy|csr] [--workers N] [--networkx]
+# [--cache DIR] [--cache-budget 10G] (ver cache.py; GRAPHGEN_CACHE tambien
+# activa la cache) [--metrics metricas.json] (ver metricas.py)
+# [--relabel none|random --seed S] (ver etiquetas.py)
+# [--shuffle --seed S --memory 1G --tmpdir DIR] (ver barajado.py)
+# [--matrix-market symmetric|general] (ver matrixmarket.py), y
+#   python -m graphgen batch manifiesto.json|manifiesto.csv [--workers N]
+# para generar muchos grafos en un solo grupo de procesos (ver lotes.py).
+#
+# Este modulo no importa NumPy ni networkx: los grafos pequenos en texto
+# se escriben en Python puro, y los demas caminos importan lo que usan
+# solo cuando se eligen.
+#
+import argparse
+import os
+import sys
+
+from graphgen import comprimido, metricas, tamanos
+
+# Arriba de este numero de aristas conviene pagar la importacion de NumPy
+PEQUENO = 100000
+
+
+def _grid_params(a):
+	dims = a.dims * 2 if len(a.dims) == 1 else a.dims
+	if a.periodic is None:
+		periodic = False
+	else:
+		periodic = [bool(p) for p in a.periodic] * (len(dims) // len(a.dims)) or True
+	return {"dims": dims, "periodic": periodic}
+
+
+def _grid_heading(p):
+	nodes, edges = tamanos.grid_size(p["dims"], p["periodic"])
+	return "%% Grid (%s) con n=%d nodes y m=%d arcos\n" % ("x".join(map(str, p["dims"])), nodes, edges)
+
+
+# Tipo de los argumentos posicionales que no son enteros
+TIPOS = {"p": float}
+
+# Familias aleatorias (graphgen.aleatorios): reciben la semilla de --seed
+ALEATORIAS = ("gnp", "gnm", "rmat", "ba", "regular")
+
+# Opciones propias de una familia: (nombre, tipo, valor por omision, ayuda)
+OPCIONES = {
+	"rmat": (
+		("a", float, 0.57, "probabilidad del cuadrante superior izquierdo"),
+		("b", float, 0.19, "probabilidad del cuadrante superior derecho"),
+		("c", float, 0.19, "probabilidad del cuadrante inferior izquierdo; d = 1 - a - b - c"),
+		("noise", float, 0.0, "ruido por nivel en las probabilidades (NSKG)"),
+		("permute", bool, False, "permuta las etiquetas de los nodos"),
+	),
+}
+
+# nombre: (argumentos posicionales, encabezado, grafo de networkx, offset)
+FAMILIAS = {
+	"path": (
+		("n",),
+		lambda p: "%% Path con n=%d nodes y m=%d arcos\n" % tamanos.path_size(p["n"]),
+		lambda nx, p: nx.path_graph(p["n"]),
+		0,
+	),
+	"cycle": (
+		("n",),
+		lambda p: "%% Cycle con n=%d nodes y m=%d arcos\n" % (p["n"], p["n"]),
+		lambda nx, p: nx.cycle_graph(p["n"]),
+		0,
+	),
+	"mesh2d": (
+		("n", "m"),
+		lambda p: "%% Mesh2D con (%dx%d) = %d nodes y m=%d arcos\n" % (p["n"], p["m"], p["n"]*p["m"], (2*p["m"]*p["n"])-p["n"]-p["m"]),
+		lambda nx, p: nx.grid_2d_graph(p["n"], p["m"]),
+		0,
+	),
+	"grid": (
+		None,
+		_grid_heading,
+		lambda nx, p: nx.grid_graph(dim=p["dims"], periodic=p["periodic"]),
+		0,
+	),
+	"tree": (
+		("h", "r"),
+		lambda p: "%% Arbol balanceado de altura %d (raiz 0) y factor de ramificacion %d\n" % (p["h"], p["r"]),
+		lambda nx, p: nx.balanced_tree(p["r"], p["h"]),
+		1,
+	),
+	"bipartite": (
+		("n1", "n2"),
+		lambda p: "%% Grafo bipartita completo con %d nodos (%d,%d)\n" % (p["n1"]+p["n2"], p["n1"], p["n2"]),
+		lambda nx, p: nx.complete_bipartite_graph(p["n1"], p["n2"]),
+		0,
+	),
+	"gnp": (
+		("n", "p"),
+		lambda p: "%% G(n,p) con n=%d nodes y p=%g (semilla %d)\n" % (p["n"], p["p"], p["seed"]),
+		lambda nx, p: nx.fast_gnp_random_graph(p["n"], p["p"], seed=p["seed"]),
+		0,
+	),
+	"gnm": (
+		("n", "m"),
+		lambda p: "%% G(n,m) con n=%d nodes y m=%d arcos (semilla %d)\n" % (p["n"], p["m"], p["seed"]),
+		lambda nx, p: nx.gnm_random_graph(p["n"], p["m"], seed=p["seed"]),
+		0,
+	),
+	"rmat": (
+		("scale", "edgefactor"),
+		lambda p: "%% R-MAT con n=%d nodes y m=%d arcos (a=%g b=%g c=%g d=%g ruido=%g%s, semilla %d)\n" % (
+			1 << p["scale"], p["edgefactor"] << p["scale"], p["a"], p["b"], p["c"], 1 - p["a"] - p["b"] - p["c"],
+			p["noise"], ", permutado" if p["permute"] else "", p["seed"]),
+		None,
+		0,
+	),
+	"ba": (
+		("n", "m"),
+		lambda p: "%% Barabasi-Albert con n=%d nodes, m=%d por nodo y %d arcos (semilla %d)\n" % (p["n"], p["m"], p["m"] * (p["n"] - p["m"]), p["seed"]),
+		lambda nx, p: nx.barabasi_albert_graph(p["n"], p["m"], seed=p["seed"]),
+		0,
+	),
+	"regular": (
+		("n", "d"),
+		lambda p: "%% Grafo %d-regular aleatorio con n=%d nodes y m=%d arcos (semilla %d)\n" % (p["d"], p["n"], p["n"] * p["d"] // 2, p["seed"]),
+		lambda nx, p: nx.random_regular_graph(p["d"], p["n"], seed=p["seed"]),
+		0,
+	),
+}
+
+
+def parser():
+	ap = argparse.ArgumentParser(prog="graphgen", description="Genera grafos de familias deterministas.")
+	sub = ap.add_subparsers(dest="family", required=True)
+	sp = sub.add_parser("batch", help="genera todos los grafos de un manifiesto")
+	sp.add_argument("manifest", metavar="manifiesto")
+	sp.add_argument("--workers", type=int, default=None)
+	for name, (names, _, _, _) in FAMILIAS.items():
+		sp = sub.add_parser(name)
+		sp.add_argument("fileName", metavar="archivo_salida")
+		if names is None:
+			sp.add_argument("dims", type=int, nargs="+")
+			sp.add_argument("--periodic", type=int, nargs="*", help="todas las dimensiones, o un 0/1 por dimension")
+		for n in names or ():
+			sp.add_argument(n, type=TIPOS.get(n, int))
+		for n, tipo, default, ayuda in OPCIONES.get(name, ()):
+			if tipo is bool:
+				sp.add_argument("--" + n, action="store_true", help=ayuda)
+			else:
+				sp.add_argument("--" + n, type=tipo, default=default, help=ayuda)
+		sp.add_argument("--format", default="text", choices=("text", "npy", "csr"))
+		sp.add_argument("--workers", type=int, default=1)
+		sp.add_argument("--networkx", action="store_true", help="usa la implementacion original con networkx")
+		sp.add_argument("--cache", metavar="DIR", default=os.environ.get("GRAPHGEN_CACHE"), help="reutiliza los grafos ya generados en DIR")
+		sp.add_argument("--cache-budget", default="10G", help="espacio maximo de la cache (por ejemplo 500M, 10G)")
+		sp.add_argument("--metrics", metavar="JSON", help="tiempos, memoria y E/S por fase")
+		sp.add_argument("--relabel", default="none", choices=("none", "random"), help="reetiqueta los nodos con una permutacion pseudoaleatoria")
+		sp.add_argument("--seed", type=int, default=0)
+		sp.add_argument("--shuffle", action="store_true", help="escribe las aristas en orden aleatorio")
+		sp.add_argument("--memory", default="1G", help="memoria para --shuffle (por ejemplo 500M, 1G)")
+		sp.add_argument("--tmpdir", help="directorio de los temporales de --shuffle")
+		sp.add_argument("--matrix-market", dest="mm", choices=("symmetric", "general"), help="texto Matrix Market con etiquetas desde 1")
+	return ap
+
+
+def _params(a):
+	names = FAMILIAS[a.family][0]
+	if names is None:
+		return _grid_params(a)
+	params = {n: getattr(a, n) for n in names}
+	for n, _, _, _ in OPCIONES.get(a.family, ()):
+		params[n] = getattr(a, n)
+	if a.family in ALEATORIAS:
+		params["seed"] = a.seed
+	return params
+
+
+def argumentos(argv):
+	"""Interpreta los argumentos de una familia y agrega a.params."""
+	ap = parser()
+	a = ap.parse_args(argv)
+	if a.family != "batch":
+		if a.shuffle and a.format == "csr":
+			ap.error("--shuffle no aplica al formato csr")
+		if a.mm and a.format != "text":
+			ap.error("--matrix-market solo aplica al formato text")
+		names = FAMILIAS[a.family][0]
+		sizes = a.dims if names is None else [getattr(a, n) for n in names if TIPOS.get(n, int) is int]
+		if any(x < 0 for x in sizes):
+			ap.error("los tamanos no pueden ser negativos")
+		if a.family == "grid" and a.periodic and len(a.periodic) != len(a.dims):
+			ap.error("--periodic necesita ninguna bandera o una por dimension (%d)" % len(a.dims))
+		if a.family == "grid" and a.periodic is not None and any(d == 1 and (p or not a.periodic) for d, p in zip(a.dims, a.periodic or a.dims)):
+			ap.error("--periodic no aplica a dimensiones de tamano 1 (networkx les pondria lazos)")
+		if a.family == "gnp" and not 0 <= a.p <= 1:
+			ap.error("p debe estar entre 0 y 1")
+		if a.family == "gnm" and not 0 <= a.m <= a.n * (a.n - 1) // 2:
+			ap.error("G(n, m) necesita 0 <= m <= n(n-1)/2")
+		if a.family == "ba" and not 1 <= a.m < a.n:
+			ap.error("Barabasi-Albert necesita 1 <= m < n")
+		if a.family == "regular" and not (0 <= a.d < a.n and a.n * a.d % 2 == 0):
+			ap.error("el grafo d-regular necesita 0 <= d < n y n*d par")
+		if a.networkx and FAMILIAS[a.family][2] is None:
+			ap.error("networkx no tiene la familia %s" % a.family)
+		if a.family == "rmat":
+			d = 1 - a.a - a.b - a.c
+			if min(a.a, a.b, a.c) < 0 or d < -1e-12:
+				ap.error("R-MAT necesita a, b, c >= 0 y a + b + c <= 1")
+			if not 0 <= a.noise <= min(a.b, a.c, (a.a + d) / 2):
+				ap.error("el ruido debe estar entre 0 y min(b, c, (a+d)/2)")
+			if not 0 <= a.scale <= 62:
+				ap.error("scale debe estar entre 0 y 62")
+		a.params = _params(a)
+	return a
+
+
+def aristas(a):
+	"""Numero de aristas del grafo que pide a, sin generarlo; para las
+	familias aleatorias, el numero esperado."""
+	edges = getattr(tamanos, a.family + "_size")(**a.params)[1]
+	if edges is None:
+		edges = getattr(tamanos, a.family + "_expected")(**a.params)
+	return edges
+
+
+def genera(a):
+	"""Genera el grafo que piden los argumentos ya interpretados a."""
+	m = metricas.Metricas() if a.metrics else metricas.NULA
+	# Datos que solo se conocen al generar, como las rondas de reparacion
+	extra = {}
+	if a.cache:
+		from graphgen import cache
+		relabel = [a.relabel, a.seed] if a.relabel != "none" else None
+		shuffle = a.seed if a.shuffle else None
+		formato = a.format + (comprimido.compresion(a.fileName) or "") + (":" + a.mm if a.mm else "")
+		key = cache.clave(a.family, a.params, formato, a.networkx, relabel, shuffle)
+		budget = cache.presupuesto(a.cache_budget)
+		with m.fase("cache"):
+			hit = cache.obten(a.cache, key, a.fileName, lambda path: extra.update(_genera(a, path, m)), budget)
+	else:
+		hit = None
+		_desliga(a.fileName)
+		extra.update(_genera(a, a.fileName, m))
+	if a.metrics:
+		m.fsync(a.fileName)
+		nodes, edges = getattr(tamanos, a.family + "_size")(**a.params)
+		edges = extra.pop("edges", edges)
+		if edges is None:
+			# Un acierto de la cache de una familia aleatoria: el numero
+			# esta en la salida
+			edges = _aristas_salida(a)
+		m.escribe(a.metrics, a.fileName, family=a.family, params=a.params, format=a.format,
+			workers=a.workers, networkx=a.networkx, cache_hit=hit, nodes=nodes, edges=edges, **extra)
+	return hit
+
+
+def _aristas_salida(a):
+	"""Numero de aristas de una salida ya escrita, segun su encabezado."""
+	if a.format != "text":
+		import json
+		with open(os.path.join(a.fileName, "header.json")) as fo:
+			return json.load(fo)["m"]
+	with comprimido.abre(a.fileName) as fo:
+		line = next(l for l in fo if not l.startswith("%"))
+	entries = int(line.split()[2])
+	if a.mm != "general":
+		return entries
+	from graphgen import matrixmarket
+	loops = matrixmarket.lazos(a.family, a.params)
+	return None if loops is None else (entries + loops) // 2
+
+
+def _desliga(fileName):
+	# Una salida servida por la cache es un hardlink a la entrada: hay que
+	# romper el enlace antes de sobreescribirla en su lugar
+	if os.path.isdir(fileName):
+		paths = [os.path.join(fileName, f) for f in os.listdir(fileName)]
+	else:
+		paths = [fileName]
+	for path in paths:
+		if os.path.isfile(path) and os.stat(path).st_nlink > 1:
+			os.remove(path)
+
+
+def _genera(a, fileName, m):
+	"""Escribe el grafo en fileName; regresa el numero de aristas y los
+	datos del encabezado que solo se conocen al generar."""
+	_, heading, graph, offset = FAMILIAS[a.family]
+	params = a.params
+	heading = heading(params)
+	nodes, edges = getattr(tamanos, a.family + "_size")(**params)
+	if a.mm:
+		# Matrix Market cuenta desde 1 en todas las familias
+		offset = 1
+	relabel = None
+	if a.relabel == "random":
+		with m.fase("import"):
+			from graphgen import etiquetas
+		relabel = etiquetas.Feistel(nodes, a.seed)
+	shuffle = None
+	if a.shuffle:
+		with m.fase("import"):
+			from graphgen import barajado, cache
+		shuffle = barajado.Barajado(a.seed, cache.presupuesto(a.memory), a.tmpdir or os.path.dirname(os.path.abspath(fileName)))
+	if a.networkx:
+		with m.fase("import"):
+			import networkx as nx
+			from graphgen import salida
+		with m.fase("construccion"):
+			W = graph(nx, params)
+		with m.fase("etiquetas"):
+			W = nx.convert_node_labels_to_integers(W)
+			if relabel is not None:
+				W = nx.relabel_nodes(W, dict(enumerate(relabel(range(nodes)).tolist())))
+		with m.fase("escritura"):
+			header = salida.escribe_networkx(fileName, heading, W, a.family, params, a.format, offset, relabel, shuffle, a.mm)
+		return {"edges": header["m"]}
+	elif a.family not in ALEATORIAS and a.format == "text" and a.workers <= 1 and edges <= PEQUENO and not comprimido.compresion(fileName) and relabel is None and shuffle is None and not a.mm:
+		with m.fase("import"):
+			from graphgen import pequenos
+		with m.fase("escritura"):
+			it = getattr(pequenos, a.family + "_edges")(**params)
+			pequenos.escribe_grafo(fileName, heading, nodes, edges, it, offset)
+		return {"edges": edges}
+	else:
+		with m.fase("import"):
+			from graphgen import salida
+		with m.fase("escritura"):
+			header = salida.escribe(fileName, heading, a.family, params, a.format, a.workers, offset, relabel, shuffle, a.mm)
+		return dict({k: header[k] for k in ("repair_rounds",) if k in header}, edges=header["m"])
+
+
+def main(argv=None):
+	a = argumentos(argv)
+	if a.family == "batch":
+		from graphgen import lotes
+		sys.exit(lotes.ejecuta(lotes.lee_manifiesto(a.manifest), a.workers))
+	genera(a)
@@ -0,0 +1,84 @@
+#
+# Salida de texto comprimida mientras se genera: si el archivo de salida
+# termina en .gz, .bz2 o .xz, cada bloque de aristas se formatea y se
+# comprime por separado (en los procesos de --workers, si los hay) y los
+# resultados se concatenan en orden. gzip, bzip2 y xz aceptan archivos con
+# varios miembros (streams) concatenados, asi que cualquier descompresor
+# estandar lee el archivo completo y obtiene el mismo texto de siempre.
+#
+import collections
+import os
+
+EXTENSIONES = (".gz", ".bz2", ".xz")
+
+
+def compresion(fileName):
+	"""Extension de compresion de fileName, o None."""
+	ext = os.path.splitext(fileName)[1]
+	return ext if ext in EXTENSIONES else None
+
+
+def abre(fileName):
+	"""Abre fileName como texto, descomprimiendolo si hace falta."""
+	ext = compresion(fileName)
+	if ext == ".gz":
+		import gzip
+		return gzip.open(fileName, "rt")
+	if ext == ".bz2":
+		import bz2
+		return bz2.open(fileName, "rt")
+	if ext == ".xz":
+		import lzma
+		return lzma.open(fileName, "rt")
+	return open(fileName)
+
+
+def comprime(ext, data):
+	"""Un miembro completo del formato `ext` con los bytes data."""
+	if ext == ".gz":
+		import gzip
+		return gzip.compress(data, compresslevel=6, mtime=0)
+	if ext == ".bz2":
+		import bz2
+		return bz2.compress(data)
+	import lzma
+	return lzma.compress(data)
+
+
+def _miembro(ext, generador, params, start, stop, offset):
+	from graphgen import escritor
+	chunks = generador(**params, start=start, stop=stop)
+	return comprime(ext, b"".join(escritor.formatea(u, v, offset) for u, v in chunks))
+
+
+def _encabezado(ext, heading, nodes, edges):
+	return comprime(ext, heading.encode() + ("%d %d %d\n" % (nodes, nodes, edges)).encode())
+
+
+def escribe_bloques(fileName, heading, nodes, edges, chunks, offset=0):
+	"""Como escritor.escribe_grafo, con un miembro comprimido por bloque."""
+	from graphgen import escritor
+	ext = compresion(fileName)
+	with open(fileName, "wb") as fo:
+		fo.write(_encabezado(ext, heading, nodes, edges))
+		for u, v in chunks:
+			fo.write(comprime(ext, escritor.formatea(u, v, offset).tobytes()))
+
+
+def escribe_grafo(fileName, heading, nodes, edges, generador, params, blocks, workers, offset=0):
+	"""Como paralelo.escribe_grafo, comprimiendo cada uno de los `blocks`
+	bloques de generador(**params) en `workers` procesos."""
+	ext = compresion(fileName)
+	if workers <= 1:
+		return escribe_bloques(fileName, heading, nodes, edges, generador(**params), offset)
+	from concurrent.futures import ProcessPoolExecutor
+	with ProcessPoolExecutor(workers) as pool, open(fileName, "wb") as fo:
+		fo.write(_encabezado(ext, heading, nodes, edges))
+		# Pocos bloques pendientes a la vez para no acumular memoria
+		tasks = collections.deque()
+		for b in range(blocks):
+			tasks.append(pool.submit(_miembro, ext, generador, params, b, b + 1, offset))
+			if len(tasks) >= 2 * workers:
+				fo.write(tasks.popleft().result())
+		while tasks:
+			fo.write(tasks.popleft().result())
@@ -0,0 +1,123 @@
+#
+# Escritura de bloques de aristas en el formato "u v" por linea.
+# Cada bloque se convierte a ASCII con operaciones de NumPy sobre todo el
+# arreglo y se escribe con una sola llamada, en lugar de formatear y
+# escribir arista por arista.
+#
+import itertools
+import numpy as np
+
+
+def _digitos(out, x):
+	"""Escribe en las columnas de out los digitos decimales de cada x,
+	rellenos con ceros a la izquierda.
+
+	x se parte en grupos de 4 digitos en uint16, donde la division de
+	NumPy procesa el doble de elementos por instruccion que en uint32.
+	"""
+	c = out.shape[1]
+	while c > 0:
+		if c > 4:
+			q = x // 10000
+			y = (x - q * 10000).astype(np.uint16)
+			x = q
+		else:
+			y = x.astype(np.uint16)
+		t = np.empty_like(y)
+		for j in range(c - 1, max(c - 4, 0) - 1, -1):
+			q = y // 10
+			np.multiply(q, 10, out=t)
+			np.subtract(y, t, out=out[:, j], casting="unsafe")
+			y = q
+		c -= 4
+
+
+def _visibles(x, w):
+	"""Mascara (len(x), w) de los digitos que no son ceros de relleno, o
+	True si todos los valores tienen exactamente w digitos."""
+	if x.min() >= 10 ** (w - 1):
+		return True
+	nd = np.ones(len(x), dtype=np.uint8)
+	for p in range(1, w):
+		nd += x >= 10 ** p
+	return np.arange(w - 1, -1, -1, dtype=np.uint8) < nd[:, None]
+
+
+def formatea(u, v, offset=0):
+	"""Regresa un arreglo uint8 con las lineas "u v\\n" del bloque.
+
+	Las lineas se arman como filas de ancho fijo; los ceros de relleno
+	solo se quitan hasta la ultima linea con un numero mas corto.
+	"""
+	u = np.asarray(u, dtype=np.int64)
+	v = np.asarray(v, dtype=np.int64)
+	if offset:
+		u, v = u + offset, v + offset
+	if not len(u):
+		return np.empty(0, dtype=np.uint8)
+	mu, mv = int(u.max()), int(v.max())
+	# La division en 32 bits es casi el doble de rapida
+	if max(mu, mv) < 1 << 32:
+		u, v = u.astype(np.uint32), v.astype(np.uint32)
+	wu, wv = len(str(mu)), len(str(mv))
+	mat = np.empty((len(u), wu + wv + 2), dtype=np.uint8)
+	_digitos(mat[:, :wu], u)
+	_digitos(mat[:, wu + 1:-1], v)
+	mat += 48
+	mat[:, wu] = 32
+	mat[:, -1] = 10
+	# Solo hay que quitar relleno hasta la ultima linea con un numero
+	# corto; con etiquetas crecientes eso es un prefijo pequeno del bloque
+	corto = (u < 10 ** (wu - 1)) | (v < 10 ** (wv - 1))
+	k = len(u) - int(corto[::-1].argmax()) if corto.any() else 0
+	if not k:
+		return mat.ravel()
+	keep = np.ones((k, mat.shape[1]), dtype=bool)
+	keep[:, :wu] = _visibles(u[:k], wu)
+	keep[:, wu + 1:-1] = _visibles(v[:k], wv)
+	if k == len(u):
+		return mat[keep]
+	return np.concatenate((mat[:k][keep], mat[k:].ravel()))
+
+
+def longitud(u, v, offset=0):
+	"""Bytes que ocupa el bloque formateado, sin formatearlo."""
+	u = np.asarray(u, dtype=np.int64) + offset
+	v = np.asarray(v, dtype=np.int64) + offset
+	total = 4 * len(u)
+	for x in (u, v):
+		top = x.max() if len(x) else 0
+		for p in range(1, 19):
+			if 10 ** p > top:
+				break
+			total += int(np.count_nonzero(x >= 10 ** p))
+	return total
+
+
+def bloques(edges, chunk=1 << 20):
+	"""Agrupa un iterable de aristas (u, v) en bloques de arreglos."""
+	it = iter(edges)
+	while True:
+		e = np.fromiter(itertools.chain.from_iterable(itertools.islice(it, chunk)), dtype=np.int64)
+		if not len(e):
+			return
+		yield e[0::2], e[1::2]
+
+
+def escribe_bloques(fo, chunks, offset=0):
+	"""Escribe cada bloque (u, v) en el archivo binario fo sumando `offset`
+	a las etiquetas. Regresa el numero de bytes escritos."""
+	total = 0
+	for u, v in chunks:
+		buf = formatea(u, v, offset)
+		fo.write(buf)
+		total += len(buf)
+	return total
+
+
+def escribe_grafo(fileName, heading, nodes, edges, chunks, offset=0):
+	"""Escribe el archivo completo: comentario, linea "n n m" y aristas."""
+	with open(fileName, "wb") as fo:
+		fo.write(heading.encode())
+		fo.write(("%d %d %d\n" % (nodes, nodes, edges)).encode())
+		escribe_bloques(fo, chunks, offset)
@@ -0,0 +1,121 @@
+#
+# Reetiquetado pseudoaleatorio de los nodos sin guardar una permutacion:
+# una red de Feistel con llaves derivadas de la semilla es una biyeccion
+# de [0, 2^2h) con 2^2h >= n, y aplicandola de nuevo a los valores que
+# caen fuera de [0, n) ("cycle walking") queda una biyeccion de [0, n).
+# Todo se calcula por bloques de aristas, asi que cada proceso reetiqueta
+# su tramo por su cuenta y el resultado no depende de --workers.
+#
+import numpy as np
+
+from graphgen import familias, tamanos
+
+RONDAS = 4
+
+_C1 = np.uint64(0xBF58476D1CE4E5B9)
+_C2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mezcla(x, key, mask):
+	# Finalizador de splitmix64 sobre x ^ key, recortado a media palabra
+	z = x ^ key
+	z = (z ^ (z >> np.uint64(30))) * _C1
+	z = (z ^ (z >> np.uint64(27))) * _C2
+	return (z ^ (z >> np.uint64(31))) & mask
+
+
+class Feistel:
+	"""Permutacion pseudoaleatoria de [0, n) determinada por `seed`."""
+
+	def __init__(self, n, seed, rondas=RONDAS):
+		self.n = n
+		self.seed = seed
+		self.half = max((max(n, 2) - 1).bit_length() + 1, 2) // 2
+		self.keys = np.random.SeedSequence(seed).generate_state(rondas, dtype=np.uint64)
+
+	def _rondas(self, x, keys, inversa):
+		half = np.uint64(self.half)
+		mask = np.uint64((1 << self.half) - 1)
+		l, r = x >> half, x & mask
+		for key in keys:
+			if inversa:
+				l, r = r ^ _mezcla(l, key, mask), l
+			else:
+				l, r = r, l ^ _mezcla(r, key, mask)
+		return (l << half) | r
+
+	def _aplica(self, x, inversa):
+		keys = self.keys[::-1] if inversa else self.keys
+		x = np.asarray(x, dtype=np.uint64)
+		y = self._rondas(x.ravel(), keys, inversa)
+		fuera = np.flatnonzero(y >= self.n)
+		while len(fuera):
+			y[fuera] = self._rondas(y[fuera], keys, inversa)
+			fuera = fuera[y[fuera] >= self.n]
+		return y.astype(np.int64).reshape(x.shape)
+
+	def __call__(self, x):
+		"""Nueva etiqueta de cada nodo del arreglo x."""
+		return self._aplica(x, False)
+
+	def inversa(self, y):
+		"""Nodo original de cada nueva etiqueta del arreglo y."""
+		return self._aplica(y, True)
+
+	def encabezado(self):
+		return {"method": "random", "seed": self.seed, "rounds": len(self.keys)}
+
+
+class Reetiquetado:
+	"""Generador de aristas de graphgen.familias con los nodos reetiquetados
+	por perm; se puede mandar a los procesos de paralelo como el original."""
+
+	def __init__(self, generador, perm):
+		self.generador = generador
+		self.perm = perm
+
+	def __call__(self, **params):
+		for u, v in self.generador(**params):
+			yield self.perm(u), self.perm(v)
+
+
+def bloques(chunks, perm):
+	"""Reetiqueta un iterable de bloques (u, v)."""
+	for u, v in chunks:
+		yield perm(u), perm(v)
+
+
+def grados(family, params, perm, chunk=familias.CHUNK):
+	"""Bloques de grados en el orden de las nuevas etiquetas."""
+	degrees = getattr(familias, family + "_degrees")
+	nodes = getattr(tamanos, family + "_size")(**params)[0]
+	for lo in range(0, nodes, chunk):
+		yield degrees(**params, k=perm.inversa(np.arange(lo, min(lo + chunk, nodes))))
+
+
+def _bipartite_vecinos(n1, n2, perm, chunk):
+	# Todas las filas de A son las etiquetas de B ordenadas, y al reves
+	b = np.sort(perm(np.arange(n1, n1 + n2)))
+	a = np.sort(perm(np.arange(n1)))
+	rows = max(chunk // max(n1, n2, 1), 1)
+	for lo in range(0, n1 + n2, rows):
+		v = perm.inversa(np.arange(lo, min(lo + rows, n1 + n2)))
+		yield np.concatenate([b if x < n1 else a for x in v])
+
+
+def vecinos(family, params, perm, chunk=familias.CHUNK):
+	"""Bloques de listas de adyacencia ordenadas, en el orden de las nuevas
+	etiquetas: la fila k son los vecinos del nodo perm.inversa(k)."""
+	if family == "bipartite":
+		yield from _bipartite_vecinos(params["n1"], params["n2"], perm, chunk)
+		return
+	candidatos = getattr(familias, "_" + family + "_candidatos")
+	nodes = getattr(tamanos, family + "_size")(**params)[0]
+	width = candidatos(**params, k=np.zeros(1, dtype=np.int64))[0].shape[1]
+	for lo in range(0, nodes, max(chunk // max(width, 1), 1)):
+		k = np.arange(lo, min(lo + max(chunk // max(width, 1), 1), nodes))
+		cand, keep = candidatos(**params, k=perm.inversa(k))
+		# Los que no existen se van al final de la fila al ordenar
+		mapped = np.where(keep, perm(np.where(keep, cand, 0)), np.iinfo(np.int64).max)
+		mapped.sort(axis=1)
+		yield mapped[np.sort(keep, axis=1)[:, ::-1]]
@@ -0,0 +1,448 @@
+#
+# Generadores nativos de aristas para las familias deterministas.
+# Cada generador produce bloques (u, v) de arreglos int64 con a lo mas
+# `chunk` aristas, en el mismo orden en que networkx las reporta, sin
+# construir el grafo en memoria.
+#
+import numpy as np
+
+from graphgen.tamanos import (
+	cycle_size, grid_shape, grid_size, path_size, tree_size,
+)
+
+CHUNK = 1 << 20
+
+
+def _tramos(total, step, start=0, stop=None):
+	"""Intervalos [lo, hi) de tamano step que cubren range(total), del
+	bloque start al stop-1. Cada bloque depende solo de su indice."""
+	blocks = -(-total // step)
+	for t in range(start, blocks if stop is None else min(stop, blocks)):
+		yield t * step, min((t + 1) * step, total)
+
+
+def _rango(total, step, start=0, stop=None):
+	"""El intervalo [lo, hi) que cubren los bloques start..stop-1 de _tramos."""
+	blocks = -(-total // step)
+	stop = blocks if stop is None else min(stop, blocks)
+	return min(start * step, total), min(max(stop, start) * step, total)
+
+
+def _cifras(lo, hi, cuenta, desde):
+	"""Total de digitos decimales de f(k) para los k de un conjunto S en
+	[lo, hi), sin recorrerlos: cuenta(K) es el numero de elementos de S
+	menores que K y desde(t) el primer k con f(k) >= t, con f no
+	decreciente en S. Cada potencia de 10 agrega un digito a los k de ahi
+	en adelante."""
+	total = cuenta(hi) - cuenta(lo)
+	t = 10
+	while True:
+		k = max(lo, desde(t))
+		if k >= hi:
+			return total
+		total += cuenta(hi) - cuenta(k)
+		t *= 10
+
+
+def _todos(k):
+	return k
+
+
+def _vecinos(nodes, width, chunk, candidatos):
+	"""Listas de adyacencia en orden de fila de los nodos 0..nodes-1.
+
+	candidatos(k) regresa una matriz (len(k), width) con los posibles
+	vecinos de cada nodo, ya en orden creciente, y la mascara de los que
+	existen; no hace falta ordenar nada despues.
+	"""
+	for lo, hi in _tramos(nodes, max(chunk // width, 1)):
+		cand, keep = candidatos(np.arange(lo, hi, dtype=np.int64))
+		yield cand[keep]
+
+
+def path_blocks(n, chunk=CHUNK):
+	"""Numero de bloques que produce path_edges."""
+	return -(-path_size(n)[1] // chunk)
+
+
+def path_edges(n, chunk=CHUNK, start=0, stop=None):
+	"""Aristas (i, i+1) de un path con n nodos."""
+	for lo, hi in _tramos(path_size(n)[1], chunk, start, stop):
+		yield path_edges_in_range(n, lo, hi)
+
+
+def path_edges_in_range(n, lo, hi):
+	"""Aristas lo..hi-1 de path_edges, calculadas por su posicion."""
+	u = np.arange(lo, hi, dtype=np.int64)
+	return u, u + 1
+
+
+def path_bytes(n, chunk=CHUNK, start=0, stop=None, offset=0):
+	"""Bytes del texto de los bloques start..stop-1 de path_edges, en forma
+	cerrada."""
+	lo, hi = _rango(path_size(n)[1], chunk, start, stop)
+	return 2 * (hi - lo) + _cifras(lo, hi, _todos, lambda t: t - offset) + _cifras(lo, hi, _todos, lambda t: t - 1 - offset)
+
+
+def _path_candidatos(n, k):
+	return np.stack((k - 1, k + 1), axis=1), np.stack((k > 0, k < n - 1), axis=1)
+
+
+def path_degrees(n, k):
+	"""Grado de cada nodo del arreglo k."""
+	return _path_candidatos(n, k)[1].sum(axis=1)
+
+
+def path_neighbors(n, chunk=CHUNK):
+	"""Bloques con las listas de adyacencia ordenadas, nodo por nodo."""
+	return _vecinos(n, 2, chunk, lambda k: _path_candidatos(n, k))
+
+
+def cycle_blocks(n, chunk=CHUNK):
+	"""Numero de bloques que produce cycle_edges."""
+	return -(-cycle_size(n)[1] // chunk)
+
+
+def cycle_edges(n, chunk=CHUNK, start=0, stop=None):
+	"""Aristas de un cycle con n nodos: (0,1), (0,n-1), (1,2), ..., (n-2,n-1)."""
+	for lo, hi in _tramos(cycle_size(n)[1], chunk, start, stop):
+		yield cycle_edges_in_range(n, lo, hi)
+
+
+def cycle_edges_in_range(n, lo, hi):
+	"""Aristas lo..hi-1 de cycle_edges, calculadas por su posicion."""
+	k = np.arange(lo, hi, dtype=np.int64)
+	u = np.maximum(k - 1, 0)
+	v = np.where(k >= 2, k, np.where(k == 0, min(1, n - 1), n - 1))
+	return u, v
+
+
+def cycle_bytes(n, chunk=CHUNK, start=0, stop=None, offset=0):
+	"""Bytes del texto de los bloques start..stop-1 de cycle_edges, en
+	forma cerrada: desde la arista 2 son (k-1, k)."""
+	lo, hi = _rango(cycle_size(n)[1], chunk, start, stop)
+	u, v = cycle_edges_in_range(n, lo, min(hi, 2))
+	total = sum(len(str(x + offset)) + len(str(y + offset)) + 2 for x, y in zip(u.tolist(), v.tolist()))
+	lo = max(lo, 2)
+	if lo >= hi:
+		return total
+	return total + 2 * (hi - lo) + _cifras(lo, hi, _todos, lambda t: t + 1 - offset) + _cifras(lo, hi, _todos, lambda t: t - offset)
+
+
+def _cycle_candidatos(n, k):
+	if n < 3:
+		# n=2: el otro nodo; n=1: el lazo (0, 0), que se guarda una vez
+		return (n - 1 - k)[:, None], np.ones((len(k), 1), dtype=bool)
+	a, b = (k - 1) % n, (k + 1) % n
+	return np.stack((np.minimum(a, b), np.maximum(a, b)), axis=1), np.ones((len(k), 2), dtype=bool)
+
+
+def cycle_degrees(n, k):
+	"""Numero de vecinos de cada nodo del arreglo k."""
+	return _cycle_candidatos(n, k)[1].sum(axis=1)
+
+
+def cycle_neighbors(n, chunk=CHUNK):
+	"""Bloques con las listas de adyacencia ordenadas, nodo por nodo."""
+	return _vecinos(n, 2, chunk, lambda k: _cycle_candidatos(n, k))
+
+
+def mesh2d_blocks(n, m, chunk=CHUNK):
+	"""Numero de bloques que produce mesh2d_edges."""
+	return -(-n * m // max(chunk // 2, 1))
+
+
+def mesh2d_edges(n, m, chunk=CHUNK, start=0, stop=None):
+	"""Aristas de una malla n x m con el nodo (i, j) etiquetado k = i*m + j.
+
+	Cada nodo k aporta primero la arista vertical (k, k+m) y luego la
+	horizontal (k, k+1), como networkx. Los nodos se recorren en bandas
+	de a lo mas chunk/2 nodos, asi la memoria no depende de n*m.
+	"""
+	total = n * m
+	for lo, hi in _tramos(total, max(chunk // 2, 1), start, stop):
+		k = np.arange(lo, hi, dtype=np.int64)
+		keep = np.stack((k < total - m, k % m < m - 1), axis=1).ravel()
+		u = np.repeat(k, 2)[keep]
+		v = np.stack((k + m, k + 1), axis=1).ravel()[keep]
+		yield u, v
+
+
+def mesh2d_edges_in_range(n, m, lo, hi):
+	"""Aristas lo..hi-1 de mesh2d_edges, calculadas por su posicion.
+
+	Cada fila menos la ultima aporta 2m-1 aristas, alternando vertical y
+	horizontal con la vertical del ultimo nodo al final; la ultima fila
+	solo aporta sus m-1 horizontales.
+	"""
+	e = np.arange(lo, hi, dtype=np.int64)
+	row = 2 * m - 1
+	body = (n - 1) * row
+	i, r = np.divmod(np.minimum(e, body), max(row, 1))
+	vertical = (e < body) & (r % 2 == 0)
+	u = np.where(e < body, i * m + r // 2, (n - 1) * m + e - body)
+	return u, np.where(vertical, u + m, u + 1)
+
+
+def mesh2d_bytes(n, m, chunk=CHUNK, start=0, stop=None, offset=0):
+	"""Bytes del texto de los bloques start..stop-1 de mesh2d_edges, en
+	forma cerrada: las verticales (k, k+m) de los nodos fuera de la ultima
+	fila y las horizontales (k, k+1) de los nodos fuera de la ultima
+	columna."""
+	lo, hi = _rango(n * m, max(chunk // 2, 1), start, stop)
+	top = min(hi, n * m - m)
+	total = 0
+	if lo < top:
+		total += 2 * (top - lo) + _cifras(lo, top, _todos, lambda t: t - offset) + _cifras(lo, top, _todos, lambda t: t - m - offset)
+	horizontal = lambda K: K // m * (m - 1) + min(K % m, m - 1)
+	if m > 1:
+		total += 2 * (horizontal(hi) - horizontal(lo))
+		total += _cifras(lo, hi, horizontal, lambda t: t - offset) + _cifras(lo, hi, horizontal, lambda t: t - 1 - offset)
+	return total
+
+
+def _mesh2d_candidatos(n, m, k):
+	i, j = k // m, k % m
+	cand = np.stack((k - m, k - 1, k + 1, k + m), axis=1)
+	return cand, np.stack((i > 0, j > 0, j < m - 1, i < n - 1), axis=1)
+
+
+def mesh2d_degrees(n, m, k):
+	"""Grado de cada nodo del arreglo k."""
+	return _mesh2d_candidatos(n, m, k)[1].sum(axis=1)
+
+
+def mesh2d_neighbors(n, m, chunk=CHUNK):
+	"""Bloques con las listas de adyacencia ordenadas, nodo por nodo."""
+	return _vecinos(n * m, 4, chunk, lambda k: _mesh2d_candidatos(n, m, k))
+
+
+def tree_blocks(r, h, chunk=CHUNK):
+	"""Numero de bloques que produce tree_edges."""
+	return -(-tree_size(r, h)[1] // chunk)
+
+
+def tree_edges(r, h, chunk=CHUNK, start=0, stop=None):
+	"""Aristas (padre, hijo) de un arbol r-ario perfecto de altura h.
+
+	El hijo j = 1, ..., N-1 tiene padre (j-1)//r, y networkx reporta las
+	aristas ordenadas por hijo.
+	"""
+	for lo, hi in _tramos(tree_size(r, h)[1], chunk, start, stop):
+		yield tree_edges_in_range(r, h, lo, hi)
+
+
+def tree_edges_in_range(r, h, lo, hi):
+	"""Aristas lo..hi-1 de tree_edges: la arista k es la del hijo k+1."""
+	j = np.arange(lo + 1, hi + 1, dtype=np.int64)
+	return (j - 1) // r, j
+
+
+def tree_bytes(r, h, chunk=CHUNK, start=0, stop=None, offset=0):
+	"""Bytes del texto de los bloques start..stop-1 de tree_edges, en forma
+	cerrada: la arista k es (k // r, k + 1)."""
+	lo, hi = _rango(tree_size(r, h)[1], chunk, start, stop)
+	return 2 * (hi - lo) + _cifras(lo, hi, _todos, lambda t: r * (t - offset)) + _cifras(lo, hi, _todos, lambda t: t - 1 - offset)
+
+
+def _tree_candidatos(r, h, k):
+	nodes = tree_size(r, h)[0]
+	children = r * k[:, None] + np.arange(1, r + 1)
+	cand = np.column_stack(((k - 1) // max(r, 1), children))
+	return cand, np.column_stack((k > 0, children < nodes))
+
+
+def tree_degrees(r, h, k):
+	"""Grado de cada nodo del arreglo k."""
+	return _tree_candidatos(r, h, k)[1].sum(axis=1)
+
+
+def tree_neighbors(r, h, chunk=CHUNK):
+	"""Bloques con las listas de adyacencia ordenadas: el padre y luego
+	los hijos de cada nodo."""
+	return _vecinos(tree_size(r, h)[0], r + 1, chunk, lambda k: _tree_candidatos(r, h, k))
+
+
+def bipartite_tile(n1, n2, chunk=CHUNK):
+	"""Regresa (aristas por bloque, numero de bloques) del bipartita completo.
+
+	Un bloque son varias filas completas de la parte A contra toda la parte
+	B; si una sola fila no cabe en `chunk`, el bloque es un tramo de fila.
+	"""
+	m = n1 * n2
+	size = max(chunk // n2, 1) * n2 if 0 < n2 <= chunk else chunk
+	return size, -(-m // size)
+
+
+def bipartite_blocks(n1, n2, chunk=CHUNK):
+	"""Numero de bloques que produce bipartite_edges."""
+	return bipartite_tile(n1, n2, chunk)[1]
+
+
+def bipartite_edges(n1, n2, chunk=CHUNK, start=0, stop=None):
+	"""Aristas (u, n1+v) en orden por filas, de los bloques start a stop-1.
+
+	Cada bloque se calcula solo a partir de su indice, asi que varios
+	procesos pueden repartirse los bloques sin coordinarse.
+	"""
+	for lo, hi in _tramos(n1 * n2, bipartite_tile(n1, n2, chunk)[0], start, stop):
+		yield bipartite_edges_in_range(n1, n2, lo, hi)
+
+
+def bipartite_edges_in_range(n1, n2, lo, hi):
+	"""Aristas lo..hi-1 de bipartite_edges, calculadas por su posicion."""
+	k = np.arange(lo, hi, dtype=np.int64)
+	return k // n2, n1 + k % n2
+
+
+def bipartite_bytes(n1, n2, chunk=CHUNK, start=0, stop=None, offset=0):
+	"""Bytes del texto de los bloques start..stop-1 de bipartite_edges, en
+	forma cerrada: la arista k es (k // n2, n1 + k % n2)."""
+	lo, hi = _rango(n1 * n2, bipartite_tile(n1, n2, chunk)[0], start, stop)
+	total = 2 * (hi - lo) + _cifras(lo, hi, _todos, lambda t: n2 * (t - offset))
+	# La columna se repite en cada fila: se cuentan los k con k % n2 >= c
+	columna = lambda c, K: K // n2 * (n2 - c) + max(K % n2 - c, 0)
+	t = 1
+	while True:
+		c = min(max(t - n1 - offset, 0), n2)
+		if c >= n2:
+			return total
+		total += columna(c, hi) - columna(c, lo)
+		t *= 10
+
+
+def bipartite_degrees(n1, n2, k):
+	"""Grado de cada nodo del arreglo k."""
+	return np.where(k < n1, n2, n1)
+
+
+def bipartite_neighbors(n1, n2, chunk=CHUNK):
+	"""Bloques con las listas de adyacencia ordenadas, nodo por nodo.
+
+	Las filas de A son n1..n1+n2-1 y las de B son 0..n1-1; cada entrada se
+	calcula por su posicion, asi que una fila mas grande que `chunk`
+	tambien se parte en bloques.
+	"""
+	m = n1 * n2
+	for lo, hi in _tramos(2 * m, chunk):
+		p = np.arange(lo, hi, dtype=np.int64)
+		yield np.where(p < m, n1 + p % max(n2, 1), (p - m) % max(n1, 1))
+
+
+def _grid_step(dims, chunk):
+	return max(chunk // (2 * len(dims)), 1) if dims else 1
+
+
+def grid_blocks(dims, periodic=False, chunk=CHUNK):
+	"""Numero de bloques que produce grid_edges."""
+	return -(-grid_size(dims, periodic)[0] // _grid_step(dims, chunk))
+
+
+def grid_edges(dims, periodic=False, chunk=CHUNK, start=0, stop=None):
+	"""Aristas de una malla con tamanos `dims` y bordes periodicos opcionales.
+
+	El nodo con coordenadas (x_0, ..., x_{D-1}) se etiqueta con
+	k = sum(x_i * stride_i), con stride_0 = 1 como en nx.grid_graph. Cada
+	nodo aporta sus vecinos posteriores de la ultima dimension a la
+	primera, y en cada una primero k + stride_i y luego la vuelta del toro.
+	"""
+	nodes = grid_size(dims, periodic)[0]
+	for lo, hi in _tramos(nodes, _grid_step(dims, chunk), start, stop):
+		yield _grid_posteriores(dims, periodic, np.arange(lo, hi, dtype=np.int64))
+
+
+def _grid_posteriores(dims, periodic, k):
+	"""Las aristas que aportan los nodos del arreglo k, en orden."""
+	strides, wrap = grid_shape(dims, periodic)
+	targets, keep = [], []
+	for d, s, p in reversed(list(zip(dims, strides, wrap))):
+		x = k // s % d
+		targets += [k + s, k + (d - 1) * s]
+		keep += [x < d - 1, (x == 0) & p]
+	keep = np.stack(keep, axis=1).ravel()
+	return np.repeat(k, len(targets))[keep], np.stack(targets, axis=1).ravel()[keep]
+
+
+def _grid_previas(dims, periodic, k):
+	"""Numero de aristas que aportan los nodos 0..k-1 en grid_edges."""
+	strides, wrap = grid_shape(dims, periodic)
+	total = np.zeros(len(k), dtype=np.int64)
+	for d, s, p in zip(dims, strides, wrap):
+		q, r = np.divmod(k, d * s)
+		total += q * (d - 1) * s + np.minimum(r, (d - 1) * s)
+		if p:
+			total += q * s + np.minimum(r, s)
+	return total
+
+
+def _grid_nodo(dims, periodic, e):
+	"""El nodo que aporta la arista e: el ultimo k con previas(k) <= e."""
+	a, b = 0, grid_size(dims, periodic)[0]
+	while a < b:
+		mid = (a + b + 1) // 2
+		if _grid_previas(dims, periodic, np.array([mid]))[0] <= e:
+			a = mid
+		else:
+			b = mid - 1
+	return a
+
+
+def grid_edges_in_range(dims, periodic, lo, hi):
+	"""Aristas lo..hi-1 de grid_edges, calculadas por su posicion.
+
+	Los nodos que aportan la primera y la ultima arista se buscan por
+	biseccion sobre el numero de aristas de los nodos anteriores, que tiene
+	forma cerrada; luego solo se expanden los nodos entre ellos.
+	"""
+	if lo >= hi:
+		return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+	a, b = _grid_nodo(dims, periodic, lo), _grid_nodo(dims, periodic, hi - 1)
+	u, v = _grid_posteriores(dims, periodic, np.arange(a, b + 1, dtype=np.int64))
+	skip = lo - int(_grid_previas(dims, periodic, np.array([a]))[0])
+	return u[skip:skip + hi - lo], v[skip:skip + hi - lo]
+
+
+def grid_bytes(dims, periodic=False, chunk=CHUNK, start=0, stop=None, offset=0):
+	"""Bytes del texto de los bloques start..stop-1 de grid_edges, en forma
+	cerrada. En cada dimension los nodos con x < d-1 aportan (k, k + s) y,
+	si es periodica, los de x = 0 aportan (k, k + (d-1)s); los dos
+	conjuntos se cuentan como en _grid_previas."""
+	lo, hi = _rango(grid_size(dims, periodic)[0], _grid_step(dims, chunk), start, stop)
+	strides, wrap = grid_shape(dims, periodic)
+	total = 0
+	for d, s, p in zip(dims, strides, wrap):
+		conjuntos = [(lambda K, d=d, s=s: K // (d * s) * (d - 1) * s + min(K % (d * s), (d - 1) * s), s)]
+		if p:
+			conjuntos.append((lambda K, d=d, s=s: K // (d * s) * s + min(K % (d * s), s), (d - 1) * s))
+		for cuenta, salto in conjuntos:
+			total += 2 * (cuenta(hi) - cuenta(lo))
+			total += _cifras(lo, hi, cuenta, lambda t: t - offset) + _cifras(lo, hi, cuenta, lambda t, salto=salto: t - salto - offset)
+	return total
+
+
+def _grid_candidatos(dims, periodic, k):
+	strides, wrap = grid_shape(dims, periodic)
+	cand, keep = [], []
+	# Como stride_{i+1} = d_i * stride_i, estas columnas ya van en orden
+	# creciente: primero los vecinos menores de la ultima dimension a la
+	# primera y luego los mayores de la primera a la ultima
+	for d, s, p in reversed(list(zip(dims, strides, wrap))):
+		x = k // s % d
+		cand += [k - (d - 1) * s, k - s]
+		keep += [(x == d - 1) & p, x > 0]
+	for d, s, p in zip(dims, strides, wrap):
+		x = k // s % d
+		cand += [k + s, k + (d - 1) * s]
+		keep += [x < d - 1, (x == 0) & p]
+	return np.stack(cand, axis=1), np.stack(keep, axis=1)
+
+
+def grid_degrees(dims, periodic, k):
+	"""Grado de cada nodo del arreglo k."""
+	return _grid_candidatos(dims, periodic, k)[1].sum(axis=1)
+
+
+def grid_neighbors(dims, periodic=False, chunk=CHUNK):
+	"""Bloques con las listas de adyacencia ordenadas, nodo por nodo."""
+	nodes = grid_size(dims, periodic)[0]
+	return _vecinos(nodes, 4 * len(dims), chunk, lambda k: _grid_candidatos(dims, periodic, k))
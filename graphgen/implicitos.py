@@ -0,0 +1,147 @@
+#
+# Grafos implicitos de las familias deterministas: solo guardan sus
+# parametros y calculan nodos, grados, vecinos y aristas con aritmetica,
+# asi que sirven para grafos mucho mas grandes que la memoria.
+#   g = ImplicitMesh2D(4096, 4096)
+#   g.num_nodes, g.num_edges, g.degree(v), g.neighbors(v)
+#   g.degrees(np.arange(...))            grados vectorizados
+#   for u, v in g.edges(chunk=1 << 20):  aristas por bloques, en el orden
+#                                        de los scripts genera*.py
+#   g.edge_at(k), g.edges_in_range(lo, hi)
+#                                        la arista k sin generar las demas
+#   g.escribe("malla.txt", "csr")        cualquier formato de salida.py
+#
+import numpy as np
+
+from graphgen import familias, tamanos
+
+
+class Implicito:
+	"""Base de los grafos implicitos; `family` es el nombre de la familia
+	en graphgen.familias y `params` sus argumentos."""
+	family = None
+
+	def __init__(self, **params):
+		self.params = params
+
+	def __repr__(self):
+		return "%s(%s)" % (type(self).__name__, ", ".join("%s=%r" % p for p in self.params.items()))
+
+	def __eq__(self, other):
+		return type(self) is type(other) and self.params == other.params
+
+	def __hash__(self):
+		return hash((type(self).__name__, repr(self.params)))
+
+	def _f(self, name):
+		return getattr(familias, self.family + "_" + name)
+
+	@property
+	def num_nodes(self):
+		return getattr(tamanos, self.family + "_size")(**self.params)[0]
+
+	@property
+	def num_edges(self):
+		return getattr(tamanos, self.family + "_size")(**self.params)[1]
+
+	def _nodo(self, v):
+		if not 0 <= v < self.num_nodes:
+			raise IndexError("nodo %d fuera de 0..%d" % (v, self.num_nodes - 1))
+		return np.array([v], dtype=np.int64)
+
+	def degrees(self, k):
+		"""Grados de los nodos del arreglo k."""
+		return self._f("degrees")(**self.params, k=np.asarray(k, dtype=np.int64))
+
+	def degree(self, v):
+		return int(self.degrees(self._nodo(v))[0])
+
+	def neighbors(self, v):
+		"""Arreglo ordenado con los vecinos de v."""
+		cand, keep = getattr(familias, "_" + self.family + "_candidatos")(**self.params, k=self._nodo(v))
+		return cand[keep]
+
+	def num_blocks(self, chunk=familias.CHUNK):
+		"""Numero de bloques que produce edges(chunk)."""
+		return self._f("blocks")(**self.params, chunk=chunk)
+
+	def edges(self, chunk=familias.CHUNK, start=0, stop=None):
+		"""Bloques (u, v) de aristas, de los bloques start a stop-1."""
+		return self._f("edges")(**self.params, chunk=chunk, start=start, stop=stop)
+
+	def edges_in_range(self, lo, hi):
+		"""Arreglos (u, v) con las aristas lo..hi-1 en el orden de edges(),
+		sin generar las anteriores."""
+		if not 0 <= lo <= hi <= self.num_edges:
+			raise IndexError("aristas %d..%d fuera de 0..%d" % (lo, hi, self.num_edges))
+		return self._f("edges_in_range")(**self.params, lo=lo, hi=hi)
+
+	def edge_at(self, k):
+		"""La arista numero k en el orden de edges()."""
+		u, v = self.edges_in_range(k, k + 1)
+		return int(u[0]), int(v[0])
+
+	def adjacency(self, chunk=familias.CHUNK):
+		"""Bloques con las listas de adyacencia ordenadas, nodo por nodo."""
+		return self._f("neighbors")(**self.params, chunk=chunk)
+
+	def escribe(self, fileName, formato="text", workers=1):
+		"""Escribe el grafo como lo haria python -m graphgen."""
+		from graphgen import cli, salida
+		_, heading, _, offset = cli.FAMILIAS[self.family]
+		salida.escribe(fileName, heading(self.params), self.family, self.params, formato, workers, offset)
+
+
+class ImplicitPath(Implicito):
+	family = "path"
+
+	def __init__(self, n):
+		super().__init__(n=n)
+
+
+class ImplicitCycle(Implicito):
+	family = "cycle"
+
+	def __init__(self, n):
+		super().__init__(n=n)
+
+
+class ImplicitMesh2D(Implicito):
+	family = "mesh2d"
+
+	def __init__(self, n, m):
+		super().__init__(n=n, m=m)
+
+
+class ImplicitGrid(Implicito):
+	family = "grid"
+
+	def __init__(self, dims, periodic=False):
+		super().__init__(dims=list(dims), periodic=periodic)
+
+
+class ImplicitTree(Implicito):
+	family = "tree"
+
+	def __init__(self, r, h):
+		super().__init__(r=r, h=h)
+
+
+class ImplicitBipartite(Implicito):
+	family = "bipartite"
+
+	def __init__(self, n1, n2):
+		super().__init__(n1=n1, n2=n2)
+
+	def neighbors(self, v):
+		n1, n2 = self.params["n1"], self.params["n2"]
+		self._nodo(v)
+		return np.arange(n1, n1 + n2, dtype=np.int64) if v < n1 else np.arange(n1, dtype=np.int64)
+
+
+IMPLICITOS = {c.family: c for c in (ImplicitPath, ImplicitCycle, ImplicitMesh2D, ImplicitGrid, ImplicitTree, ImplicitBipartite)}
+
+
+def implicito(family, **params):
+	"""El grafo implicito de la familia `family` con los parametros de cli."""
+	return IMPLICITOS[family](**params)
@@ -0,0 +1,59 @@
+#
+# Lectura de los directorios que escribe graphgen/binario.py.
+# Los arreglos se abren con np.load(..., mmap_mode="r"): abrir un grafo no
+# lee las aristas, y varios procesos que abren el mismo directorio
+# comparten las mismas paginas del cache del sistema operativo.
+#
+import json
+import os
+import numpy as np
+
+
+class GrafoBinario:
+	"""Grafo de solo lectura sobre un directorio npy o csr.
+
+	Con formato csr expone indptr e indices; con formato npy expone
+	edges. Al pasarlo a otro proceso (por ejemplo con multiprocessing) se
+	vuelve a abrir desde su directorio en lugar de copiar los arreglos.
+	"""
+
+	def __init__(self, dirName):
+		self.dirName = dirName
+		with open(os.path.join(dirName, "header.json")) as fo:
+			self.header = json.load(fo)
+		self.n = self.header["n"]
+		self.m = self.header["m"]
+		self.indptr = self.indices = self.edges = None
+		if self.header["format"] == "csr":
+			self.indptr = self._abre("indptr.npy")
+			self.indices = self._abre("indices.npy")
+		else:
+			self.edges = self._abre("edges.npy")
+
+	def _abre(self, name):
+		return np.load(os.path.join(self.dirName, name), mmap_mode="r")
+
+	def __reduce__(self):
+		return GrafoBinario, (self.dirName,)
+
+	def _csr(self):
+		if self.indptr is None:
+			raise ValueError("%s no tiene formato csr" % self.dirName)
+
+	def degree(self, v):
+		"""Numero de entradas de la fila v."""
+		self._csr()
+		return int(self.indptr[v + 1] - self.indptr[v])
+
+	def degrees(self, v=None):
+		"""Grados de los nodos del arreglo v, o de todos si v es None."""
+		self._csr()
+		if v is None:
+			return np.diff(self.indptr)
+		v = np.asarray(v)
+		return self.indptr[v + 1] - self.indptr[v]
+
+	def neighbors(self, v):
+		"""Vecinos de v en orden creciente, como vista sin copia de indices."""
+		self._csr()
+		return self.indices[self.indptr[v]:self.indptr[v + 1]]
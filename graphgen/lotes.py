@@ -0,0 +1,92 @@
+#
+# Modo por lotes: genera todos los grafos de un manifiesto en un solo
+# grupo de procesos, en lugar de un interprete (y una importacion de
+# NumPy y networkx) por grafo.
+#
+# El manifiesto puede ser
+#   .json: una lista cuyos elementos son listas de argumentos, como en la
+#          linea de comandos, o diccionarios
+#          {"family": ..., "output": ..., "params": {...}, "format": ...}
+#   .csv:  un renglon por grafo con los argumentos de la linea de comandos,
+#          por ejemplo "mesh2d,salida.txt,4096,4096,--format,csr"
+# Los trabajos se mandan del mas grande al mas chico segun su numero de
+# aristas, para que el mas largo no sea el ultimo en empezar.
+#
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from graphgen import cli
+
+
+def _argumentos(job):
+	"""Convierte un trabajo en forma de diccionario en argumentos."""
+	family, params = job["family"], job.get("params", {})
+	argv = [family, job["output"]]
+	names = cli.FAMILIAS[family][0]
+	if names is None:
+		argv += [str(d) for d in params["dims"]]
+		periodic = params.get("periodic", False)
+		if periodic is True:
+			argv.append("--periodic")
+		elif periodic:
+			argv += ["--periodic"] + [str(int(p)) for p in periodic]
+	else:
+		argv += [str(params[n]) for n in names]
+	for n, tipo, _, _ in cli.OPCIONES.get(family, ()):
+		if tipo is bool and params.get(n):
+			argv.append("--" + n)
+		elif tipo is not bool and n in params:
+			argv += ["--" + n, str(params[n])]
+	if "seed" in params:
+		argv += ["--seed", str(params["seed"])]
+	if "format" in job:
+		argv += ["--format", job["format"]]
+	if job.get("networkx"):
+		argv.append("--networkx")
+	return argv
+
+
+def lee_manifiesto(fileName):
+	"""Regresa los trabajos del manifiesto como listas de argumentos."""
+	if fileName.endswith(".csv"):
+		with open(fileName, newline="") as fo:
+			rows = [[c.strip() for c in row] for row in csv.reader(fo)]
+		return [[c for c in row if c] for row in rows if row and row[0] and not row[0].startswith("#")]
+	with open(fileName) as fo:
+		return [[str(x) for x in job] if isinstance(job, list) else _argumentos(job) for job in json.load(fo)]
+
+
+def _precarga():
+	# Cada proceso importa NumPy una sola vez para todos sus trabajos
+	from graphgen import salida
+
+
+def _trabajo(argv):
+	t = time.perf_counter()
+	a = cli.argumentos(argv)
+	# Los trabajos ya corren en paralelo entre si
+	a.workers = 1
+	cli.genera(a)
+	return time.perf_counter() - t
+
+
+def ejecuta(jobs, workers=None):
+	"""Genera los trabajos (listas de argumentos) con `workers` procesos.
+	Regresa el numero de trabajos que fallaron."""
+	# Interpretar todo antes de empezar detecta errores en el manifiesto
+	parsed = [(cli.aristas(cli.argumentos(argv)), argv) for argv in jobs]
+	parsed.sort(key=lambda job: -job[0])
+	failed = 0
+	with ProcessPoolExecutor(workers, initializer=_precarga) as pool:
+		tasks = {pool.submit(_trabajo, argv): (edges, argv) for edges, argv in parsed}
+		for task in as_completed(tasks):
+			edges, argv = tasks[task]
+			try:
+				print("%-40s %12d aristas %8.2f s" % (argv[1], edges, task.result()))
+			except Exception as e:
+				failed += 1
+				print("%-40s ERROR: %s" % (argv[1], e), file=sys.stderr)
+	return failed
@@ -0,0 +1,58 @@
+#
+# Salida de texto en formato Matrix Market (matriz de adyacencia como
+# patron, etiquetas desde 1 en las seis familias):
+#   symmetric: encabezado "%%MatrixMarket matrix coordinate pattern
+#              symmetric" y cada arista una sola vez; el formato pide el
+#              triangulo inferior, asi que se escribe (max, min)
+#   general:   encabezado "... pattern general" y cada arista en los dos
+#              sentidos (los lazos una vez), listo para cargarse como CSR
+#              sin simetrizar
+# Las aristas se transforman bloque por bloque, asi que funciona igual con
+# --workers, compresion, --relabel y --shuffle.
+#
+import numpy as np
+
+MODOS = ("symmetric", "general")
+
+
+def banner(modo):
+	return "%%%%MatrixMarket matrix coordinate pattern %s\n" % modo
+
+
+def lazos(family, params):
+	"""Numero de lazos (v, v) de la familia: solo el cycle con n=1, o None
+	si hay que contarlos (R-MAT)."""
+	if family == "rmat":
+		return None
+	return 1 if family == "cycle" and params["n"] == 1 else 0
+
+
+def entradas(modo, edges, loops):
+	"""Numero de entradas que se escriben para `edges` aristas."""
+	return edges if modo == "symmetric" else 2 * edges - loops
+
+
+def transforma(u, v, modo):
+	"""Las entradas del bloque de aristas (u, v)."""
+	if modo == "symmetric":
+		return np.maximum(u, v), np.minimum(u, v)
+	# Cada arista seguida de su reverso, sin repetir los lazos
+	keep = np.stack((np.ones(len(u), dtype=bool), u != v), axis=1).ravel()
+	return np.stack((u, v), axis=1).ravel()[keep], np.stack((v, u), axis=1).ravel()[keep]
+
+
+def bloques(chunks, modo):
+	for u, v in chunks:
+		yield transforma(u, v, modo)
+
+
+class Matriz:
+	"""Generador de aristas de graphgen.familias transformado a entradas
+	Matrix Market; se puede mandar a los procesos de paralelo."""
+
+	def __init__(self, generador, modo):
+		self.generador = generador
+		self.modo = modo
+
+	def __call__(self, **params):
+		return bloques(self.generador(**params), self.modo)
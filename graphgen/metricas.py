@@ -0,0 +1,114 @@
+#
+# Instrumentacion por fase para --metrics salida.json: tiempo de pared y de
+# CPU, memoria maxima, y contadores de escritura de /proc/self/io (llamadas
+# write, bytes pasados a write y bytes que llegaron al disco) de cada fase,
+# mas el tiempo de fsync de la salida al final.
+#
+# Linux suma a /proc/self/io los contadores de los procesos hijos que ya
+# terminaron, asi que lo que escriben los procesos de --workers queda en la
+# fase en la que se cierra el grupo. Su memoria va en max_rss_children.
+# Una fase abierta dentro de otra (la generacion en un fallo de la cache)
+# lleva "parent" y no se suma otra vez en los totales.
+# Sin --metrics se usa NULA, cuyas fases no hacen nada.
+#
+import os
+import time
+
+
+def _io():
+	try:
+		with open("/proc/self/io") as fo:
+			return {k: int(v) for k, v in (line.split(":") for line in fo)}
+	except OSError:
+		return None
+
+
+def _rss():
+	import resource
+	self = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+	children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+	return self, children
+
+
+class Fase:
+	def __init__(self, metricas, nombre):
+		self.metricas = metricas
+		self.nombre = nombre
+
+	def __enter__(self):
+		self.padre = self.metricas.abiertas[-1] if self.metricas.abiertas else None
+		self.metricas.abiertas.append(self.nombre)
+		self.io = _io()
+		self.cpu = time.process_time()
+		self.wall = time.perf_counter()
+		return self
+
+	def __exit__(self, *exc):
+		wall = time.perf_counter() - self.wall
+		cpu = time.process_time() - self.cpu
+		io = _io()
+		self.metricas.abiertas.pop()
+		rss, children = _rss()
+		fase = {"phase": self.nombre, "wall_s": wall, "cpu_s": cpu, "max_rss": rss, "max_rss_children": children}
+		if io is not None and self.io is not None:
+			fase["write_syscalls"] = io["syscw"] - self.io["syscw"]
+			fase["write_chars"] = io["wchar"] - self.io["wchar"]
+			fase["write_bytes"] = io["write_bytes"] - self.io["write_bytes"]
+		if self.padre is not None:
+			fase["parent"] = self.padre
+		self.metricas.fases.append(fase)
+
+
+class Metricas:
+	def __init__(self):
+		self.fases = []
+		self.abiertas = []
+		self.inicio = time.perf_counter()
+
+	def fase(self, nombre):
+		return Fase(self, nombre)
+
+	def fsync(self, path):
+		"""Mide cuanto tarda en llegar la salida al disco."""
+		with self.fase("fsync"):
+			paths = [os.path.join(path, f) for f in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+			for p in paths:
+				fd = os.open(p, os.O_RDONLY)
+				try:
+					os.fsync(fd)
+				finally:
+					os.close(fd)
+
+	def escribe(self, fileName, path, **extra):
+		"""Escribe las metricas en JSON; `path` es la salida del grafo."""
+		import json
+		paths = [os.path.join(path, f) for f in os.listdir(path)] if os.path.isdir(path) else [path]
+		size = sum(os.path.getsize(p) for p in paths)
+		wall = time.perf_counter() - self.inicio
+		rss, children = _rss()
+		info = dict(extra, bytes=size, wall_s=wall, max_rss=rss, max_rss_children=children, phases=self.fases)
+		# Una fase anidada ya esta contada en la que la contiene
+		fases = [f for f in self.fases if "parent" not in f]
+		for k in ("write_syscalls", "write_chars", "write_bytes"):
+			if all(k in f for f in fases):
+				info[k] = sum(f[k] for f in fases)
+		info["fsync_s"] = sum(f["wall_s"] for f in self.fases if f["phase"] == "fsync")
+		with open(fileName, "w") as fo:
+			json.dump(info, fo, indent=1)
+
+
+class _Nada:
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		pass
+
+
+class _Nula:
+	def fase(self, nombre):
+		return _NADA
+
+
+_NADA = _Nada()
+NULA = _Nula()
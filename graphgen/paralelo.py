@@ -0,0 +1,82 @@
+#
+# Escritura en paralelo de un solo archivo de salida.
+# Los bloques de aristas de las familias deterministas se calculan solo a
+# partir de su indice, asi que cada proceso toma un tramo de bloques y lo
+# escribe directamente en su posicion dentro del archivo ya reservado. Las
+# posiciones salen de familias.<family>_bytes, en forma cerrada; sin ella
+# (--relabel, Matrix Market, familias aleatorias) cada proceso genera su
+# tramo una vez para medirlo. El resultado es identico byte a byte al de
+# escritor.escribe_grafo.
+#
+from concurrent.futures import ProcessPoolExecutor
+
+from graphgen import escritor
+
+
+def _reparte(blocks, shards):
+	"""Divide range(blocks) en a lo mas `shards` tramos contiguos."""
+	shards = max(min(shards, blocks), 1)
+	cuts = [blocks * i // shards for i in range(shards + 1)]
+	return list(zip(cuts[:-1], cuts[1:]))
+
+
+def _tamano(generador, params, start, stop, offset):
+	size = count = 0
+	for u, v in generador(**params, start=start, stop=stop):
+		size += escritor.longitud(u, v, offset)
+		count += len(u)
+	return size, count
+
+
+def _cuenta(generador, params, start, stop, lazos=False):
+	chunks = generador(**params, start=start, stop=stop)
+	if lazos:
+		return sum(int((u == v).sum()) for u, v in chunks)
+	return sum(len(u) for u, _ in chunks)
+
+
+def cuenta(generador, params, blocks, workers=1, lazos=False):
+	"""Numero de aristas de generador(**params), o de lazos con `lazos`,
+	para las familias aleatorias que no lo conocen de antemano; cuesta
+	generarlas una vez."""
+	if workers <= 1:
+		return _cuenta(generador, params, 0, blocks, lazos)
+	with ProcessPoolExecutor(workers) as pool:
+		return sum(pool.map(_cuenta, *zip(*[(generador, params, a, b, lazos) for a, b in _reparte(blocks, 4 * workers)])))
+
+
+def _escribe(fileName, pos, generador, params, start, stop, offset):
+	with open(fileName, "r+b") as fo:
+		fo.seek(pos)
+		escritor.escribe_bloques(fo, generador(**params, start=start, stop=stop), offset)
+
+
+def escribe_grafo(fileName, heading, nodes, edges, generador, params, blocks, workers, offset=0, medida=None):
+	"""Como escritor.escribe_grafo, repartiendo los `blocks` bloques de
+	generador(**params) entre `workers` procesos. `medida`, si se da, es
+	la <family>_bytes que calcula sin generarlos los bytes de un tramo.
+	Con `edges` None las aristas se cuentan en la pasada que mide los
+	tramos. Regresa el numero de aristas."""
+	if workers <= 1:
+		escritor.escribe_grafo(fileName, heading, nodes, edges, generador(**params), offset)
+		return edges
+	shards = _reparte(blocks, 4 * workers)
+	with ProcessPoolExecutor(workers) as pool:
+		if medida is not None:
+			sizes = [medida(**params, start=a, stop=b, offset=offset) for a, b in shards]
+		else:
+			sizes, counts = zip(*pool.map(_tamano, *zip(*[(generador, params, a, b, offset) for a, b in shards])))
+			if edges is None:
+				edges = sum(counts)
+		head = heading.encode() + ("%d %d %d\n" % (nodes, nodes, edges)).encode()
+		with open(fileName, "wb") as fo:
+			fo.write(head)
+			fo.truncate(len(head) + sum(sizes))
+		pos = len(head)
+		tasks = []
+		for (a, b), size in zip(shards, sizes):
+			tasks.append(pool.submit(_escribe, fileName, pos, generador, params, a, b, offset))
+			pos += size
+		for t in tasks:
+			t.result()
+	return edges
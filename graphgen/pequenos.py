@@ -0,0 +1,59 @@
+#
+# Generadores en Python puro para grafos pequenos.
+# Para unas cuantas miles de aristas, importar NumPy tarda mas que
+# escribir el archivo, asi que estas versiones producen las mismas
+# aristas, en el mismo orden, sin importarlo.
+#
+from graphgen.tamanos import cycle_size, grid_shape, grid_size, tree_size
+
+
+def path_edges(n):
+	for i in range(n - 1):
+		yield i, i + 1
+
+
+def cycle_edges(n):
+	for k in range(cycle_size(n)[1]):
+		if k >= 2:
+			yield k - 1, k
+		else:
+			yield 0, min(1, n - 1) if k == 0 else n - 1
+
+
+def mesh2d_edges(n, m):
+	for k in range(n * m):
+		if k < (n - 1) * m:
+			yield k, k + m
+		if k % m < m - 1:
+			yield k, k + 1
+
+
+def tree_edges(r, h):
+	for j in range(1, tree_size(r, h)[0]):
+		yield (j - 1) // r, j
+
+
+def bipartite_edges(n1, n2):
+	for u in range(n1):
+		for v in range(n1, n1 + n2):
+			yield u, v
+
+
+def grid_edges(dims, periodic=False):
+	strides, wrap = grid_shape(dims, periodic)
+	order = list(reversed(list(zip(dims, strides, wrap))))
+	for k in range(grid_size(dims, periodic)[0]):
+		for d, s, p in order:
+			x = k // s % d
+			if x < d - 1:
+				yield k, k + s
+			if p and x == 0:
+				yield k, k + (d - 1) * s
+
+
+def escribe_grafo(fileName, heading, nodes, edges, it, offset=0):
+	"""Igual que escritor.escribe_grafo, con un iterable de aristas."""
+	with open(fileName, "wb") as fo:
+		fo.write(heading.encode())
+		fo.write(("%d %d %d\n" % (nodes, nodes, edges)).encode())
+		fo.write("".join(["%d %d\n" % (u + offset, v + offset) for u, v in it]).encode())
@@ -0,0 +1,161 @@
+#
+# Seleccion del formato de salida de los scripts genera*.py
+#   text: el formato de siempre, comentario + "n n m" + una arista por linea,
+#         comprimido si el archivo termina en .gz, .bz2 o .xz (comprimido.py),
+#         o en formato Matrix Market (matrixmarket.py)
+#   npy, csr: ver graphgen/binario.py
+#
+import itertools
+import numpy as np
+
+from graphgen import aleatorios, binario, comprimido, escritor, etiquetas, familias, matrixmarket, paralelo, tamanos
+
+FORMATOS = ("text", "npy", "csr")
+
+
+def _grados(degrees, nodes, chunk=familias.CHUNK):
+	for lo in range(0, nodes, chunk):
+		yield degrees(np.arange(lo, min(lo + chunk, nodes), dtype=np.int64))
+
+
+def _modulo(family):
+	"""graphgen.familias, o graphgen.aleatorios para las familias
+	aleatorias."""
+	return familias if hasattr(familias, family + "_edges") else aleatorios
+
+
+def _barajado(fileName, heading, header, chunks, formato, offset, shuffle, mm):
+	header["shuffle"] = shuffle.encabezado()
+	chunks = shuffle(chunks, header["n"], header["m"])
+	lines = header["m"]
+	if mm is not None:
+		chunks = matrixmarket.bloques(chunks, mm)
+		lines = matrixmarket.entradas(mm, header["m"], header["loops"])
+	if formato == "text" and comprimido.compresion(fileName):
+		comprimido.escribe_bloques(fileName, heading, header["n"], lines, chunks, offset)
+	elif formato == "text":
+		escritor.escribe_grafo(fileName, heading, header["n"], lines, chunks, offset)
+	elif formato == "npy":
+		binario.escribe_npy(fileName, header, chunks)
+	else:
+		raise ValueError("el formato %s no tiene orden de aristas que barajar" % formato)
+
+
+def _cuenta_al_escribir(fileName, formato, workers, shuffle, mm):
+	"""Si el escritor puede contar las aristas en una pasada que ya hace:
+	npy corrige la forma al final, csr las cuenta al repartirlas y el texto
+	en paralelo al medir cada tramo. El texto en un solo proceso, el
+	comprimido, --shuffle y Matrix Market necesitan el numero antes."""
+	if shuffle is not None or mm is not None:
+		return False
+	if formato in ("npy", "csr"):
+		return True
+	return formato == "text" and workers > 1 and not comprimido.compresion(fileName)
+
+
+def escribe(fileName, heading, family, params, formato="text", workers=1, offset=0, relabel=None, shuffle=None, mm=None):
+	"""Escribe la familia `family` de graphgen.familias o
+	graphgen.aleatorios con los parametros `params`, un dict con los
+	argumentos de <family>_edges.
+	`offset` solo se aplica a las etiquetas del formato de texto,
+	`relabel` es una etiquetas.Feistel para reetiquetar los nodos,
+	`shuffle` un barajado.Barajado para el orden de las aristas y `mm` un
+	modo de matrixmarket.MODOS para el texto.
+	Regresa el encabezado de la salida, con el numero de aristas."""
+	modulo = _modulo(family)
+	nodes, edges = getattr(tamanos, family + "_size")(**params)
+	generador = getattr(modulo, family + "_edges")
+	# Bytes de cada tramo en forma cerrada, mientras las aristas sean las
+	# de la familia
+	medida = getattr(modulo, family + "_bytes", None)
+	blocks = getattr(modulo, family + "_blocks")(**params)
+	if blocks <= 1:
+		# Un solo bloque (Barabasi-Albert es secuencial): repartirlo entre
+		# procesos solo agregaria la pasada que mide cada tramo
+		workers = 1
+	if edges is None and not _cuenta_al_escribir(fileName, formato, workers, shuffle, mm):
+		# Una pasada extra que genera todo el grafo: el doble de trabajo
+		edges = paralelo.cuenta(generador, params, blocks, workers)
+	header = {"family": family, "params": params, "n": nodes, "m": edges}
+	prepara = getattr(modulo, family + "_prepara", None)
+	if prepara is not None:
+		# La familia genera todo el grafo de una vez (regular): antes de
+		# abrir la salida, para que un error no deje un archivo a medias
+		generador, extra = prepara(**params)
+		header.update(extra)
+		# En el texto, los mismos datos van como comentarios del encabezado
+		heading += "".join("%% %s: %s\n" % (k, extra[k]) for k in sorted(extra))
+	loops = matrixmarket.lazos(family, params)
+	if loops is None and mm == "general":
+		# Solo el modo general necesita saber cuantos lazos hay
+		loops = paralelo.cuenta(generador, params, blocks, workers, lazos=True)
+	if relabel is not None:
+		generador = etiquetas.Reetiquetado(generador, relabel)
+		medida = None
+		header["relabel"] = relabel.encabezado()
+	if mm is not None:
+		heading = matrixmarket.banner(mm) + heading
+	if shuffle is not None:
+		header["loops"] = loops
+		_barajado(fileName, heading, header, generador(**params), formato, offset, shuffle, mm)
+		return header
+	if mm is not None:
+		if formato != "text":
+			raise ValueError("Matrix Market es un formato de texto")
+		generador = matrixmarket.Matriz(generador, mm)
+		medida = None
+		edges = matrixmarket.entradas(mm, edges, loops)
+	if formato == "text" and comprimido.compresion(fileName):
+		comprimido.escribe_grafo(fileName, heading, nodes, edges, generador, params, blocks, workers, offset)
+	elif formato == "text":
+		lines = paralelo.escribe_grafo(fileName, heading, nodes, edges, generador, params, blocks, workers, offset, medida)
+		if header["m"] is None:
+			header["m"] = lines
+	elif formato == "npy":
+		binario.escribe_npy(fileName, header, generador(**params))
+	elif formato == "csr" and modulo is aleatorios:
+		estimado = None if edges is not None else getattr(tamanos, family + "_expected")(**params)
+		binario.escribe_csr_aristas(fileName, header, generador(**params), aristas=estimado)
+	elif formato == "csr" and relabel is not None:
+		binario.escribe_csr(fileName, header, etiquetas.grados(family, params, relabel), etiquetas.vecinos(family, params, relabel))
+	elif formato == "csr":
+		degrees = getattr(familias, family + "_degrees")
+		binario.escribe_csr(fileName, header, _grados(lambda k: degrees(**params, k=k), nodes), getattr(familias, family + "_neighbors")(**params))
+	else:
+		raise ValueError("formato desconocido: %s (opciones: %s)" % (formato, ", ".join(FORMATOS)))
+	return header
+
+
+def escribe_networkx(fileName, heading, W, family, params, formato="text", offset=0, relabel=None, shuffle=None, mm=None):
+	"""Como escribe, pero a partir de un grafo W de networkx con nodos
+	0..n-1."""
+	import networkx as nx
+	nodes, edges = W.number_of_nodes(), W.number_of_edges()
+	header = {"family": family, "params": params, "n": nodes, "m": edges, "networkx": True}
+	if relabel is not None:
+		header["relabel"] = relabel.encabezado()
+	if mm is not None:
+		heading = matrixmarket.banner(mm) + heading
+	chunks = escritor.bloques(W.edges(data=False))
+	if shuffle is not None:
+		header["loops"] = nx.number_of_selfloops(W)
+		_barajado(fileName, heading, header, chunks, formato, offset, shuffle, mm)
+		return header
+	if mm is not None:
+		if formato != "text":
+			raise ValueError("Matrix Market es un formato de texto")
+		chunks = matrixmarket.bloques(chunks, mm)
+		edges = matrixmarket.entradas(mm, edges, nx.number_of_selfloops(W))
+	if formato == "text" and comprimido.compresion(fileName):
+		comprimido.escribe_bloques(fileName, heading, nodes, edges, chunks, offset)
+	elif formato == "text":
+		escritor.escribe_grafo(fileName, heading, nodes, edges, chunks, offset)
+	elif formato == "npy":
+		binario.escribe_npy(fileName, header, chunks)
+	elif formato == "csr":
+		degrees = np.fromiter((len(W[v]) for v in range(nodes)), dtype=np.int64, count=nodes)
+		neighbors = np.fromiter(itertools.chain.from_iterable(sorted(W[v]) for v in range(nodes)), dtype=np.int64)
+		binario.escribe_csr(fileName, header, [degrees], [neighbors])
+	else:
+		raise ValueError("formato desconocido: %s (opciones: %s)" % (formato, ", ".join(FORMATOS)))
+	return header
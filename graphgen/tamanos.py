@@ -0,0 +1,97 @@
+#
+# Numero de nodos y aristas de cada familia, en Python puro para poder
+# calcularlos sin importar NumPy.
+#
+
+
+def path_size(n):
+	"""Regresa (nodos, arcos) de nx.path_graph(n)."""
+	return n, max(n - 1, 0)
+
+
+def cycle_size(n):
+	"""Regresa (nodos, arcos) de nx.cycle_graph(n)."""
+	# cycle_graph(1) es un lazo y cycle_graph(2) una sola arista
+	return n, n if n != 2 else 1
+
+
+def mesh2d_size(n, m):
+	"""Regresa (nodos, arcos) de nx.grid_2d_graph(n, m)."""
+	return n * m, n * max(m - 1, 0) + m * max(n - 1, 0)
+
+
+def tree_size(r, h):
+	"""Regresa (nodos, arcos) de nx.balanced_tree(r, h)."""
+	nodes = h + 1 if r == 1 else (1 - r ** (h + 1)) // (1 - r)
+	return nodes, nodes - 1
+
+
+def bipartite_size(n1, n2):
+	"""Regresa (nodos, arcos) de nx.complete_bipartite_graph(n1, n2)."""
+	return n1 + n2, n1 * n2
+
+
+def grid_shape(dims, periodic):
+	"""Regresa (strides, banderas periodicas) de una malla n-dimensional.
+	`periodic` es un booleano para todas las dimensiones o uno por
+	dimension."""
+	try:
+		periodic = [bool(p) for p in periodic]
+	except TypeError:
+		periodic = [bool(periodic)] * len(dims)
+	if len(periodic) != len(dims):
+		raise ValueError("%d banderas periodicas para %d dimensiones" % (len(periodic), len(dims)))
+	if any(p and d == 1 for p, d in zip(periodic, dims)):
+		# networkx pondria un lazo en cada nodo; aqui no hay lazos
+		raise ValueError("una dimension periodica de tamano 1 no esta soportada")
+	strides = [1]
+	for d in dims[:-1]:
+		strides.append(strides[-1] * d)
+	# Igual que networkx, un ciclo de 2 nodos no agrega una arista extra
+	return strides, [p and d > 2 for p, d in zip(periodic, dims)]
+
+
+def grid_size(dims, periodic=False):
+	"""Regresa (nodos, arcos) de nx.grid_graph(dim=dims, periodic=periodic)."""
+	nodes = 1
+	for d in dims:
+		nodes *= d
+	if not dims or not nodes:
+		return 0, 0
+	edges = 0
+	for d, p in zip(dims, grid_shape(dims, periodic)[1]):
+		edges += nodes // d * (d if p else d - 1)
+	return nodes, edges
+
+
+def gnp_size(n, p, seed=0):
+	"""Regresa (nodos, None) de G(n, p): el numero de aristas es aleatorio
+	y se conoce hasta generarlas."""
+	return n, None
+
+
+def gnp_expected(n, p, seed=0):
+	"""Numero esperado de aristas de G(n, p)."""
+	return round(p * n * (n - 1) / 2)
+
+
+def gnm_size(n, m, seed=0):
+	"""Regresa (nodos, arcos) de G(n, m)."""
+	return n, m
+
+
+def rmat_size(scale, edgefactor=16, a=0.57, b=0.19, c=0.19, noise=0.0, permute=False, seed=0):
+	"""Regresa (nodos, arcos) de R-MAT: 2^scale nodos y edgefactor * 2^scale
+	aristas, contando repetidas y lazos como Graph500."""
+	return 1 << scale, edgefactor << scale
+
+
+def ba_size(n, m, seed=0):
+	"""Regresa (nodos, arcos) de Barabasi-Albert: la estrella inicial de m
+	aristas y m mas por cada uno de los n - m - 1 nodos restantes."""
+	return n, m * (n - m)
+
+
+def regular_size(n, d, seed=0):
+	"""Regresa (nodos, arcos) del grafo d-regular aleatorio."""
+	return n, n * d // 2
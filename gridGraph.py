@@ -1,24 +1,11 @@
+#
+# Genera mallas n-dimensionales con tamanos d1 x d2 x ... y bordes
+# periodicos (toro) opcionales por dimension
+# ejecucion: python gridGraph.py archivo_salida d1 [d2 ...] [--periodic [p1 p2 ...]] [--format text|npy|csr] [--workers N] [--networkx]
+# con una sola dimension n se genera la malla n x n, como antes
+#
 import sys
-import networkx as nx
+from graphgen import cli
 
-fileName = sys.argv[1]
-n = int(sys.argv[2])
-
-G = nx.grid_graph(dim = [n,n])
-
-heading = "%% Path con n=%d nodes y m=%d arcos\n" % (n, n-1)
-W = nx.convert_node_labels_to_integers(G)
-
-# Open a file
-fo = open(fileName, "w")
-
-fo.write(heading);
-heading2 = "%d %d %d\n" % (W.number_of_nodes(), W.number_of_nodes(), W.number_of_edges())
-fo.write(heading2);
-
-for e in W.edges(data=False):
-	arco = "%d %d\n" % (e[0], e[1])
-	fo.write(arco)
-
-# Close opend file
-fo.close()
\ No newline at end of file
+if __name__ == "__main__":
+	cli.main(["grid"] + sys.argv[1:])